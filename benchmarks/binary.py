@@ -0,0 +1,198 @@
+import argparse
+import timeit
+
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Optional
+
+import psycopg
+
+from psycopg import pq
+from psycopg.adapt import AdaptersMap, PyFormat, Transformer
+from psycopg.types.composite import CompositeInfo, register_composite
+
+integer_oid = 23
+text_oid = 25
+boolean_oid = 16
+timestamptz_oid = 1184
+numeric_oid = 1700
+point_data_oid = 1_000_001
+point_data_array_oid = 1_000_002
+point_data_notnull_oid = 1_000_003
+point_data_notnull_array_oid = 1_000_004
+shape_data_oid = 1_000_005
+shape_data_array_oid = 1_000_006
+
+
+@dataclass
+class PointData:
+    point_id: int
+    label: Optional[str]
+    x: Decimal
+    y: Decimal
+    visible: bool
+
+
+@dataclass
+class ShapeData:
+    shape_id: int
+    name: Optional[str]
+    created: datetime
+    origin: Optional[PointData]
+    points: list[PointData]
+
+
+class BenchmarkAdaptContext:
+    def __init__(self) -> None:
+        self.adapters = AdaptersMap(psycopg.adapters)
+        self.connection = None
+
+
+def get_composite_fields(obj: Any, info: CompositeInfo) -> tuple[Any, ...]:
+    return tuple(getattr(obj, field.name) for field in fields(obj))
+
+
+def get_adapt_context() -> BenchmarkAdaptContext:
+    adapt_context = BenchmarkAdaptContext()
+    point_fields = ["point_id", "label", "x", "y", "visible"]
+    point_field_types = [
+        integer_oid,
+        text_oid,
+        numeric_oid,
+        numeric_oid,
+        boolean_oid,
+    ]
+    for oid, array_oid, name in [
+        (point_data_oid, point_data_array_oid, "point_data"),
+        (
+            point_data_notnull_oid,
+            point_data_notnull_array_oid,
+            "point_data_notnull",
+        ),
+    ]:
+        register_composite(
+            CompositeInfo(
+                name,
+                oid,
+                array_oid,
+                field_names=point_fields,
+                field_types=point_field_types,
+            ),
+            adapt_context,
+            PointData,
+            make_sequence=get_composite_fields,
+        )
+    register_composite(
+        CompositeInfo(
+            "shape_data",
+            shape_data_oid,
+            shape_data_array_oid,
+            field_names=["shape_id", "name", "created", "origin", "points"],
+            field_types=[
+                integer_oid,
+                text_oid,
+                timestamptz_oid,
+                point_data_oid,
+                point_data_notnull_array_oid,
+            ],
+        ),
+        adapt_context,
+        ShapeData,
+        make_sequence=get_composite_fields,
+    )
+    return adapt_context
+
+
+def get_point(point_index: int) -> PointData:
+    return PointData(
+        point_index,
+        f"point {point_index}" if point_index % 3 else None,
+        Decimal(point_index) / 7,
+        Decimal(point_index * 13) / 11,
+        point_index % 2 == 0,
+    )
+
+
+def get_shape(shape_index: int, points: int) -> ShapeData:
+    return ShapeData(
+        shape_index,
+        f"shape {shape_index}",
+        datetime(2024, 1, 1, tzinfo=UTC) + timedelta(minutes=shape_index),
+        get_point(shape_index),
+        [get_point(point_index) for point_index in range(points)],
+    )
+
+
+def get_encoded_rows(
+    adapt_context: BenchmarkAdaptContext,
+    rows: int,
+    points: int,
+    format: PyFormat,
+) -> list[bytes]:
+    transformer = Transformer(adapt_context)
+    encoded_rows: list[bytes] = []
+    for shape_index in range(rows):
+        shape = get_shape(shape_index, points)
+        encoded_row = transformer.get_dumper(shape, format).dump(shape)
+        if encoded_row is None:
+            raise RuntimeError(f"Could not encode shape {shape_index}")
+        encoded_rows.append(bytes(encoded_row))
+    return encoded_rows
+
+
+def run_benchmark(rows: int, points: int, repeat: int):
+    adapt_context = get_adapt_context()
+    print(
+        f"{rows} rows of shape_data with {points} nested point_data each, "
+        f"psycopg {psycopg.__version__} ({pq.__impl__} implementation)"
+    )
+    best_times: dict[str, float] = {}
+    for name, format, pq_format in [
+        ("text", PyFormat.TEXT, pq.Format.TEXT),
+        ("binary", PyFormat.BINARY, pq.Format.BINARY),
+    ]:
+        encoded_rows = get_encoded_rows(adapt_context, rows, points, format)
+        loader = Transformer(adapt_context).get_loader(
+            shape_data_oid, pq_format
+        )
+        expected_rows = [
+            get_shape(shape_index, points) for shape_index in range(10)
+        ]
+        if [loader.load(row) for row in encoded_rows[:10]] != expected_rows[
+            :rows
+        ]:
+            raise RuntimeError(f"Decoding {name} rows did not round trip")
+        best_time = min(
+            timeit.repeat(
+                lambda loader=loader, encoded_rows=encoded_rows: [
+                    loader.load(row) for row in encoded_rows
+                ],
+                number=1,
+                repeat=repeat,
+            )
+        )
+        best_times[name] = best_time
+        encoded_size = sum(len(row) for row in encoded_rows)
+        print(
+            f"  {name}: {best_time * 1000:.1f} ms, "
+            f"{best_time / rows * 1_000_000:.1f} us/row, "
+            f"{encoded_size / rows:.0f} bytes/row"
+        )
+    print(f"  binary speedup: {best_times['text'] / best_times['binary']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare decoding nested composites from the text and binary protocols"
+    )
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--points", type=int, nargs="+", default=[0, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for points in args.points:
+        run_benchmark(args.rows, points, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
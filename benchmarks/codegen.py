@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Optional
+
+from postgrescodegen.classes import ScriptManifest
+from postgrescodegen.processor import process_user_script_files
+from postgrescodegen.profiling import StageTimer
+
+scalar_field_types = [
+    "TEXT_NOTNULL",
+    "BOOLEAN_NOTNULL",
+    "INTEGER",
+    "DECIMAL",
+    "BIGINT_NOTNULL",
+    "TIMESTAMP WITH TIME ZONE",
+    "INTERVAL",
+    "TEXT",
+]
+
+
+@dataclass
+class BenchmarkCase:
+    types: int
+    fields: int
+    functions: int
+    functions_per_file: int
+    jobs: int
+
+
+def get_field_type(type_index: int, field_index: int) -> str:
+    if type_index > 0 and field_index % 4 == 3:
+        nested_type_index = (type_index * 7 + field_index) % type_index
+        if field_index % 8 == 3:
+            return f"type_{nested_type_index}_notnull[]"
+        return f"type_{nested_type_index}"
+    return scalar_field_types[
+        (type_index + field_index) % len(scalar_field_types)
+    ]
+
+
+def get_type_script(type_index: int, fields: int) -> str:
+    field_lines = ",\n".join(
+        f"    field_{field_index} {get_field_type(type_index, field_index)}"
+        for field_index in range(fields)
+    )
+    return f"""CREATE TYPE type_{type_index} AS (
+{field_lines}
+);
+
+CREATE DOMAIN type_{type_index}_notnull AS type_{type_index} NOT NULL;
+"""
+
+
+def get_alphabetic_name(index: int) -> str:
+    letters = ""
+    while True:
+        index, remainder = divmod(index, 26)
+        letters = chr(ord("a") + remainder) + letters
+        if index == 0:
+            return letters
+        index -= 1
+
+
+def get_function_script(function_index: int, types: int) -> str:
+    composite_type_index = function_index % types
+    array_type_index = (function_index * 3 + 1) % types
+    function_name = f"function_{get_alphabetic_name(function_index)}"
+    returns = (
+        "VOID"
+        if function_index % 3 == 0
+        else f"SETOF type_{composite_type_index}"
+    )
+    return f"""CREATE OR REPLACE FUNCTION {function_name} (
+    p_id INTEGER_NOTNULL,
+    p_name TEXT,
+    p_created TIMESTAMP_NOTNULL,
+    p_row type_{composite_type_index},
+    p_rows type_{array_type_index}_notnull[],
+    p_ids INTEGER_NOTNULL[] DEFAULT NULL
+) RETURNS {returns}
+LANGUAGE plpgsql
+AS
+$$
+BEGIN
+    -- rows are only read; never written
+    PERFORM p_id, p_name, p_created;
+    RETURN;
+END;
+$$;
+"""
+
+
+def write_script_tree(user_scripts_path: Path, case: BenchmarkCase):
+    type_scripts_path = user_scripts_path / "types"
+    function_scripts_path = user_scripts_path / "functions"
+    type_scripts_path.mkdir(parents=True)
+    function_scripts_path.mkdir(parents=True)
+    for type_index in range(case.types):
+        type_script_file = (
+            type_scripts_path / f"{type_index:06}_type_{type_index}.sql"
+        )
+        with open(type_script_file, "w") as f:
+            f.write(get_type_script(type_index, case.fields))
+    for file_index, first_function_index in enumerate(
+        range(0, case.functions, case.functions_per_file)
+    ):
+        last_function_index = min(
+            case.functions, first_function_index + case.functions_per_file
+        )
+        with open(
+            function_scripts_path / f"functions_{file_index}.sql", "w"
+        ) as f:
+            f.write(
+                "\n".join(
+                    get_function_script(function_index, case.types)
+                    for function_index in range(
+                        first_function_index, last_function_index
+                    )
+                )
+            )
+
+
+def get_peak_rss_kib() -> dict[str, int]:
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def run_codegen(
+    user_scripts_path: Path,
+    python_source_root: Path,
+    case: BenchmarkCase,
+    previous_manifest: Optional[ScriptManifest],
+) -> tuple[dict[str, Any], ScriptManifest]:
+    stage_timer = StageTimer()
+    start_time = time.perf_counter()
+    generated_files, written_files, manifest = process_user_script_files(
+        python_source_root,
+        "bench.db",
+        user_scripts_path,
+        None,
+        previous_manifest,
+        jobs=case.jobs,
+        stage_timer=stage_timer,
+    )
+    wall_time = time.perf_counter() - start_time
+    result = {
+        "wall_time": wall_time,
+        "stages": stage_timer.get_stage_durations(),
+        "generated_files": len(generated_files),
+        "written_files": len(written_files),
+    }
+    return result, manifest
+
+
+def run_benchmark_case(case: BenchmarkCase) -> dict[str, Any]:
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        user_scripts_path = Path(temporary_directory) / "input"
+        python_source_root = Path(temporary_directory) / "output"
+        start_time = time.perf_counter()
+        write_script_tree(user_scripts_path, case)
+        synthesis_time = time.perf_counter() - start_time
+        cold_result, manifest = run_codegen(
+            user_scripts_path, python_source_root, case, None
+        )
+        warm_result, _ = run_codegen(
+            user_scripts_path, python_source_root, case, manifest
+        )
+    return {
+        "case": asdict(case),
+        "synthesis_time": synthesis_time,
+        "cold": cold_result,
+        "warm": warm_result,
+        "peak_rss_kib": get_peak_rss_kib(),
+    }
+
+
+def run_benchmark_case_in_fresh_process(case: BenchmarkCase) -> dict[str, Any]:
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=get_context("spawn")
+    ) as pool:
+        return pool.submit(run_benchmark_case, case).result()
+
+
+def print_benchmark_result(result: dict[str, Any]):
+    case = result["case"]
+    print(
+        f"{case['types']} types x {case['fields']} fields, "
+        f"{case['functions']} functions, {case['jobs']} jobs"
+    )
+    for run_name in ["cold", "warm"]:
+        run_result = result[run_name]
+        stages = ", ".join(
+            f"{stage_name} {stage_duration * 1000:.0f}ms"
+            for stage_name, stage_duration in run_result["stages"].items()
+        )
+        print(
+            f"  {run_name}: {run_result['wall_time'] * 1000:.0f}ms "
+            f"({run_result['written_files']}/{run_result['generated_files']} "
+            f"files written; {stages})"
+        )
+    peak_rss = result["peak_rss_kib"]
+    print(
+        f"  peak rss: {peak_rss['self'] / 1024:.1f} MiB, "
+        f"workers {peak_rss['children'] / 1024:.1f} MiB"
+    )
+
+
+def get_benchmark_cases(
+    scales: list[int],
+    types: int,
+    fields: int,
+    functions: int,
+    functions_per_file: int,
+    jobs: list[int],
+) -> list[BenchmarkCase]:
+    return [
+        BenchmarkCase(
+            types * scale,
+            fields,
+            functions * scale,
+            functions_per_file,
+            case_jobs,
+        )
+        for scale in scales
+        for case_jobs in jobs
+    ]
+
+
+def write_benchmark_results(results_path: Path, results: list[dict[str, Any]]):
+    with open(results_path, "w") as f:
+        json.dump(
+            {
+                "benchmark": "codegen",
+                "created": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure code generation time and memory on synthetic schemas"
+    )
+    parser.add_argument("--types", type=int, default=100)
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--functions", type=int, default=200)
+    parser.add_argument("--functions-per-file", type=int, default=5)
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="Multipliers applied to the number of types and functions",
+    )
+    parser.add_argument("-j", "--jobs", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Path to write the machine readable results to",
+    )
+    args = parser.parse_args()
+    results: list[dict[str, Any]] = []
+    for case in get_benchmark_cases(
+        args.scales,
+        args.types,
+        args.fields,
+        args.functions,
+        args.functions_per_file,
+        args.jobs,
+    ):
+        result = run_benchmark_case_in_fresh_process(case)
+        print_benchmark_result(result)
+        results.append(result)
+    if args.json is not None:
+        write_benchmark_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import compileall
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from codegen import BenchmarkCase, write_script_tree
+
+from postgrescodegen.classes import CodegenOptions
+from postgrescodegen.processor import (
+    finish_output_directory,
+    process_user_script_files,
+)
+
+import_timing_code = """
+import time
+import psycopg
+start_time = time.perf_counter()
+{import_statement}
+print(time.perf_counter() - start_time)
+"""
+
+import_statements = {
+    "register": (
+        "import bench.db.types.register",
+        "import bench.db.types.register",
+    ),
+    "one type": (
+        "from bench.db.types.type_0 import Type0",
+        "from bench.db.types import Type0",
+    ),
+    "one function": (
+        "from bench.db.functions.functions_0 import function_a",
+        "from bench.db.functions import function_a",
+    ),
+}
+
+
+def generate_package(
+    user_scripts_path: Path,
+    python_source_root: Path,
+    codegen_options: CodegenOptions,
+):
+    with redirect_stdout(io.StringIO()):
+        generated_files, written_files, manifest = process_user_script_files(
+            python_source_root,
+            "bench.db",
+            user_scripts_path,
+            None,
+            None,
+            codegen_options=codegen_options,
+        )
+        finish_output_directory(
+            python_source_root,
+            "bench.db",
+            None,
+            generated_files,
+            written_files,
+            manifest,
+            codegen_options=codegen_options,
+        )
+        compileall.compile_dir(python_source_root, quiet=1)
+
+
+def get_import_time(
+    python_source_root: Path, import_statement: str, repeat: int
+) -> float:
+    environment = dict(os.environ, PYTHONPATH=str(python_source_root))
+    import_times: list[float] = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                import_timing_code.format(import_statement=import_statement),
+            ],
+            env=environment,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        import_times.append(float(result.stdout))
+    return min(import_times)
+
+
+def run_benchmark(case: BenchmarkCase, repeat: int):
+    print(
+        f"{case.types} types x {case.fields} fields, {case.functions} functions, "
+        f"Python {sys.version.split()[0]}, best of {repeat} fresh processes"
+    )
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        user_scripts_path = Path(temporary_directory) / "input"
+        write_script_tree(user_scripts_path, case)
+        python_source_roots = {}
+        for is_lazy in [False, True]:
+            python_source_root = Path(temporary_directory) / f"output_{is_lazy}"
+            generate_package(
+                user_scripts_path,
+                python_source_root / "bench",
+                CodegenOptions(lazy_imports=is_lazy),
+            )
+            python_source_roots[is_lazy] = python_source_root
+        for name, (
+            eager_statement,
+            lazy_statement,
+        ) in import_statements.items():
+            eager_time = get_import_time(
+                python_source_roots[False], eager_statement, repeat
+            )
+            lazy_time = get_import_time(
+                python_source_roots[True], lazy_statement, repeat
+            )
+            print(
+                f"  {name}: eager {eager_time * 1000:.1f} ms, "
+                f"lazy {lazy_time * 1000:.1f} ms, "
+                f"{eager_time / lazy_time:.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the time to import generated packages with and without lazy imports"
+    )
+    parser.add_argument("--types", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--functions", type=int, default=200)
+    parser.add_argument("--functions-per-file", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for types in args.types:
+        run_benchmark(
+            BenchmarkCase(
+                types,
+                args.fields,
+                args.functions,
+                args.functions_per_file,
+                jobs=1,
+            ),
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
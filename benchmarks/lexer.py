@@ -0,0 +1,82 @@
+import argparse
+import timeit
+
+from functools import partial
+
+from postgrescodegen.generator import get_statements_from_postgres_file_contents
+
+
+def get_statements_from_postgres_file_contents_by_splitting(
+    file_contents: str, delimiter: str = ";"
+) -> list[str]:
+    one_line_contents = file_contents.replace("\n", " ")
+    normalised_file_contents = " ".join(one_line_contents.split())
+    statements = normalised_file_contents.split(delimiter)
+    return [statement.strip() for statement in statements if len(statement) > 0]
+
+
+def get_function_script(function_index: int, body_statements: int) -> str:
+    body_lines = "\n".join(
+        f"    INSERT INTO shape (created, name) VALUES (p_created, 'shape; {i}');"
+        for i in range(body_statements)
+    )
+    return f"""-- Insert shape {function_index}; with a comment
+CREATE OR REPLACE FUNCTION insert_shape_{function_index} (
+    p_points point_data_notnull[],
+    p_created TIMESTAMP WITH TIME ZONE
+) RETURNS VOID
+LANGUAGE plpgsql
+AS
+$$
+BEGIN
+{body_lines}
+END;
+$$;
+"""
+
+
+def get_functions_file_contents(
+    function_count: int, body_statements: int
+) -> str:
+    return "\n".join(
+        get_function_script(function_index, body_statements)
+        for function_index in range(function_count)
+    )
+
+
+def run_benchmark(function_count: int, body_statements: int, repeat: int):
+    file_contents = get_functions_file_contents(function_count, body_statements)
+    print(
+        f"{function_count} functions with {body_statements} statements each, "
+        f"{len(file_contents) / 1024:.0f} KiB"
+    )
+    for name, get_statements in [
+        ("split", get_statements_from_postgres_file_contents_by_splitting),
+        ("lexer", get_statements_from_postgres_file_contents),
+    ]:
+        statements = get_statements(file_contents)
+        best_time = min(
+            timeit.repeat(
+                partial(get_statements, file_contents), number=1, repeat=repeat
+            )
+        )
+        print(
+            f"  {name}: {best_time * 1000:.2f} ms, "
+            f"{len(file_contents) / best_time / 1024 / 1024:.1f} MiB/s, "
+            f"{len(statements)} statements"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the SQL statement lexer against splitting on delimiters"
+    )
+    parser.add_argument("--functions", type=int, default=500)
+    parser.add_argument("--body-statements", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.functions, args.body_statements, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+
+from decimal import Decimal
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+
+from postgrescodegen.classes import (
+    CodegenOptions,
+    PostgresType,
+    PostgresTypeField,
+)
+from postgrescodegen.typegen import get_python_code_for_postgres_types
+
+point_data_type = PostgresType(
+    "point_data",
+    [
+        PostgresTypeField("point_id", "INTEGER_NOTNULL"),
+        PostgresTypeField("label", "TEXT"),
+        PostgresTypeField("x", "DECIMAL_NOTNULL"),
+        PostgresTypeField("y", "DECIMAL_NOTNULL"),
+        PostgresTypeField("visible", "BOOLEAN_NOTNULL"),
+        PostgresTypeField("created", "TIMESTAMP_NOTNULL"),
+    ],
+)
+
+benchmark_options = [
+    ("plain", CodegenOptions()),
+    ("slots", CodegenOptions(slots=True)),
+    ("frozen", CodegenOptions(frozen=True)),
+    ("frozen, slots", CodegenOptions(frozen=True, slots=True)),
+]
+
+
+def load_generated_module(module_name: str, python_code: str) -> ModuleType:
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        module_path = Path(temporary_directory) / f"{module_name}.py"
+        module_path.write_text(python_code)
+        spec = spec_from_file_location(module_name, module_path)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load generated module {module_name}")
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def get_generated_point_data_class(codegen_options: CodegenOptions) -> type:
+    python_code = get_python_code_for_postgres_types(
+        {}, [point_data_type], codegen_options
+    )
+    return load_generated_module("point_data", python_code).PointData
+
+
+def get_allocated_bytes_per_row(point_data_class: type, rows: int) -> float:
+    field_values = (1, "label", Decimal(1), Decimal(2), True, None)
+    gc.collect()
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    instances = [point_data_class(*field_values) for _ in range(rows)]
+    end_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_bytes = sys.getsizeof(instances)
+    return (end_bytes - start_bytes - list_bytes) / rows
+
+
+def run_benchmark(rows: int):
+    print(
+        f"{rows} rows of a {len(point_data_type.type_fields)} field composite, "
+        f"Python {sys.version.split()[0]}, field values shared between rows"
+    )
+    plain_bytes = None
+    for name, codegen_options in benchmark_options:
+        point_data_class = get_generated_point_data_class(codegen_options)
+        bytes_per_row = get_allocated_bytes_per_row(point_data_class, rows)
+        if plain_bytes is None:
+            plain_bytes = bytes_per_row
+        print(
+            f"  {name}: {bytes_per_row:.0f} bytes/row, "
+            f"{bytes_per_row * rows / 1024 / 1024:.1f} MiB total, "
+            f"{bytes_per_row / plain_bytes:.2f}x plain"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the memory used per row by the generated dataclasses with and without slots"
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    args = parser.parse_args()
+    for rows in args.rows:
+        run_benchmark(rows)
+
+
+if __name__ == "__main__":
+    main()
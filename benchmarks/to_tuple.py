@@ -0,0 +1,156 @@
+import argparse
+import sys
+import tempfile
+import timeit
+
+from dataclasses import astuple
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from postgrescodegen.classes import (
+    CodegenOptions,
+    PostgresType,
+    PostgresTypeField,
+)
+from postgrescodegen.typegen import get_python_code_for_postgres_types
+
+point_data_type = PostgresType(
+    "POINT_DATA",
+    [
+        PostgresTypeField("point_id", "INTEGER_NOTNULL"),
+        PostgresTypeField("label", "TEXT"),
+        PostgresTypeField("x", "DECIMAL_NOTNULL"),
+        PostgresTypeField("y", "DECIMAL_NOTNULL"),
+        PostgresTypeField("visible", "BOOLEAN_NOTNULL"),
+    ],
+)
+
+shape_data_type = PostgresType(
+    "SHAPE_DATA",
+    [
+        PostgresTypeField("shape_id", "INTEGER_NOTNULL"),
+        PostgresTypeField("name", "TEXT"),
+        PostgresTypeField("created", "TIMESTAMP_NOTNULL"),
+        PostgresTypeField("origin", "POINT_DATA"),
+        PostgresTypeField("points", "POINT_DATA_NOTNULL[]"),
+    ],
+)
+
+
+def load_generated_module(module_name: str, python_code: str) -> ModuleType:
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        module_path = Path(temporary_directory) / f"{module_name}.py"
+        module_path.write_text(python_code)
+        spec = spec_from_file_location(module_name, module_path)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load generated module {module_name}")
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def get_generated_namespace() -> dict[str, Any]:
+    python_code = get_python_code_for_postgres_types(
+        {}, [point_data_type, shape_data_type], CodegenOptions()
+    )
+    return vars(load_generated_module("shape_data", python_code))
+
+
+def get_shapes(namespace: dict[str, Any], rows: int, points: int) -> list[Any]:
+    point_data_class = namespace["PointData"]
+    shape_data_class = namespace["ShapeData"]
+
+    def get_point(point_index: int) -> Any:
+        return point_data_class(
+            point_index,
+            f"point {point_index}" if point_index % 3 else None,
+            Decimal(point_index) / 7,
+            Decimal(point_index * 13) / 11,
+            point_index % 2 == 0,
+        )
+
+    return [
+        shape_data_class(
+            shape_index,
+            f"shape {shape_index}",
+            datetime(2024, 1, 1, tzinfo=UTC) + timedelta(minutes=shape_index),
+            get_point(shape_index),
+            [get_point(point_index) for point_index in range(points)],
+        )
+        for shape_index in range(rows)
+    ]
+
+
+def check_null_composites(namespace: dict[str, Any]):
+    point_data_class = namespace["PointData"]
+    shape_data_class = namespace["ShapeData"]
+    shape_data_to_tuple = namespace["shape_data_to_tuple"]
+    created = datetime(2024, 1, 1, tzinfo=UTC)
+    point = point_data_class(1, None, Decimal(1), Decimal(2), True)
+    shapes = [
+        shape_data_class(1, None, created, None, None),
+        shape_data_class(2, "shape", created, point, [None, point, None]),
+    ]
+    for shape in shapes:
+        if shape_data_to_tuple(shape) != astuple(shape):
+            raise RuntimeError(
+                f"shape_data_to_tuple did not match astuple for {shape}"
+            )
+
+
+def run_benchmark(rows: int, points: int, repeat: int):
+    namespace = get_generated_namespace()
+    check_null_composites(namespace)
+    shapes = get_shapes(namespace, rows, points)
+    print(
+        f"{rows} rows of shape_data with {points} nested point_data each, "
+        f"Python {sys.version.split()[0]}"
+    )
+    to_tuple_functions: list[tuple[str, Callable[[Any], tuple[Any, ...]]]] = [
+        ("astuple", astuple),
+        ("shape_data_to_tuple", namespace["shape_data_to_tuple"]),
+    ]
+    expected_tuples = [astuple(shape) for shape in shapes[:10]]
+    best_times: dict[str, float] = {}
+    for name, to_tuple_function in to_tuple_functions:
+        if [
+            to_tuple_function(shape) for shape in shapes[:10]
+        ] != expected_tuples:
+            raise RuntimeError(f"{name} did not match astuple")
+        best_time = min(
+            timeit.repeat(
+                lambda to_tuple_function=to_tuple_function: [
+                    to_tuple_function(shape) for shape in shapes
+                ],
+                number=1,
+                repeat=repeat,
+            )
+        )
+        best_times[name] = best_time
+        print(
+            f"  {name}: {best_time * 1000:.1f} ms, "
+            f"{best_time / rows * 1_000_000:.1f} us/row"
+        )
+    print(
+        f"  generated speedup: {best_times['astuple'] / best_times['shape_data_to_tuple']:.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare converting nested composites to tuples with astuple and the generated to_tuple functions"
+    )
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--points", type=int, nargs="+", default=[0, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for points in args.points:
+        run_benchmark(args.rows, points, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
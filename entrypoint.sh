@@ -7,7 +7,20 @@ poetry run python \
     $OUTPUT_MODULE_NAME \
     --resources /app/resources \
     --watch $WATCH_FILES \
+    --debounce ${WATCH_DEBOUNCE:-1} \
     --roll $ROLL_SCRIPTS \
+    --roll-mode ${ROLL_CONNECTION_MODE:-connection} \
+    --force-roll ${FORCE_ROLL:-0} \
+    --async ${GENERATE_ASYNC:-0} \
+    --prepare ${PREPARE_STATEMENTS:-0} \
+    --transaction-mode ${TRANSACTION_MODE:-function} \
+    --binary ${BINARY_PROTOCOL:-0} \
+    --slots ${DATACLASS_SLOTS:-0} \
+    --frozen ${DATACLASS_FROZEN:-0} \
+    --row-factory ${ROW_FACTORY:-class} \
+    --arrays ${FETCH_ARRAYS:-0} \
+    --copy ${COPY_ARRAYS:-0} \
+    --lazy-imports ${LAZY_IMPORTS:-0} \
     --dbhost $DB_HOST \
     --dbport ${DB_PORT:-5432} \
     --dbuser $DB_USER \
@@ -0,0 +1,118 @@
+from postgrescodegen.classes import CodegenOptions, PostgresFunction
+from postgrescodegen.funcgen import (
+    is_postgres_function_prepared,
+    is_transaction_managed_by_functions,
+)
+
+tab = "    "
+checked_statement_name = "postgrescodegen_check"
+
+
+def is_check_module_generated(codegen_options: CodegenOptions) -> bool:
+    return codegen_options.prepare or len(codegen_options.prepare_functions) > 0
+
+
+def get_check_function_prefix(is_async: bool) -> str:
+    return "async def" if is_async else "def"
+
+
+def get_check_function_suffix(is_async: bool) -> str:
+    return "_async" if is_async else ""
+
+
+def get_check_connection_type(is_async: bool) -> str:
+    return "AsyncConnection" if is_async else "Connection"
+
+
+def get_check_await(is_async: bool) -> str:
+    return "await " if is_async else ""
+
+
+def get_check_statement_calls(
+    indent: int, postgres_function: PostgresFunction, is_async: bool
+) -> list[str]:
+    await_keyword = get_check_await(is_async)
+    argument_placeholder_string = ", ".join(
+        f"${argument_index}"
+        for argument_index in range(1, len(postgres_function.function_args) + 1)
+    )
+    return [
+        f'{tab * indent}{await_keyword}conn.execute("PREPARE {checked_statement_name} AS SELECT * FROM {postgres_function.function_name}({argument_placeholder_string})")',
+        f'{tab * indent}{await_keyword}conn.execute("DEALLOCATE {checked_statement_name}")',
+    ]
+
+
+def get_check_functions_function(
+    postgres_functions: list[PostgresFunction],
+    is_async: bool,
+    is_transaction_managed: bool,
+) -> str:
+    prefix = get_check_function_prefix(is_async)
+    suffix = get_check_function_suffix(is_async)
+    connection_type = get_check_connection_type(is_async)
+    await_keyword = get_check_await(is_async)
+    with_keyword = "async with" if is_async else "with"
+    pipeline_indent = 2 if is_transaction_managed else 1
+    check_calls = [
+        check_call
+        for postgres_function in postgres_functions
+        for check_call in get_check_statement_calls(
+            pipeline_indent + 1, postgres_function, is_async
+        )
+    ]
+    if len(check_calls) == 0:
+        check_calls = [f"{tab * (pipeline_indent + 1)}pass"]
+    pipeline_lines = [
+        f"{tab * pipeline_indent}{with_keyword} conn.pipeline():",
+        *check_calls,
+    ]
+    declaration = f"{prefix} check_functions{suffix}(conn: {connection_type}):"
+    if not is_transaction_managed:
+        return "\n".join([declaration, *pipeline_lines])
+    lines = [
+        declaration,
+        f"{tab}try:",
+        *pipeline_lines,
+        f"{tab * 2}{await_keyword}conn.commit()",
+        f"{tab}except:",
+        f"{tab * 2}{await_keyword}conn.rollback()",
+        f"{tab * 2}raise",
+    ]
+    return "\n".join(lines)
+
+
+def get_check_module_code(
+    postgres_functions: list[PostgresFunction], codegen_options: CodegenOptions
+) -> str:
+    checked_functions = sorted(
+        [
+            postgres_function
+            for postgres_function in postgres_functions
+            if is_postgres_function_prepared(postgres_function, codegen_options)
+        ],
+        key=lambda postgres_function: postgres_function.function_name,
+    )
+    psycopg_import = (
+        "from psycopg import AsyncConnection, Connection"
+        if codegen_options.generate_async
+        else "from psycopg import Connection"
+    )
+    is_transaction_managed = is_transaction_managed_by_functions(
+        codegen_options
+    )
+    check_functions = [
+        get_check_functions_function(
+            checked_functions,
+            is_async=False,
+            is_transaction_managed=is_transaction_managed,
+        )
+    ]
+    if codegen_options.generate_async:
+        check_functions.append(
+            get_check_functions_function(
+                checked_functions,
+                is_async=True,
+                is_transaction_managed=is_transaction_managed,
+            )
+        )
+    return "\n\n\n".join([psycopg_import] + check_functions)
@@ -20,6 +20,22 @@ class DbCredentials:
     password: str
 
 
+@dataclass(frozen=True)
+class CodegenOptions:
+    generate_async: bool = False
+    prepare: bool = False
+    prepare_functions: tuple[str, ...] = ()
+    transaction_mode: str = "function"
+    binary: bool = False
+    slots: bool = False
+    frozen: bool = False
+    row_factory: str = "class"
+    row_factory_functions: tuple[tuple[str, str], ...] = ()
+    arrays: bool = False
+    copy: bool = False
+    lazy_imports: bool = False
+
+
 @dataclass
 class InputArgs:
     user_scripts_path: Path
@@ -28,7 +44,14 @@ class InputArgs:
     resources_path: Path
     watch_files: bool
     roll_scripts: bool
+    roll_mode: str
+    force_roll: bool
     db_credentials: Optional[DbCredentials]
+    manifest_path: Optional[Path]
+    jobs: int
+    watch_debounce_seconds: float
+    profile_path: Optional[Path]
+    codegen_options: CodegenOptions
 
 
 class PostgresObject:
@@ -77,13 +100,6 @@ class PostgresDomain(PythonablePostgresObject):
         return get_python_name_for_postgres_type_name(self.underlying_type)
 
 
-@dataclass
-class PythonPostgresModule[T: PostgresObject]:
-    module_name: str
-    module_objects: list[T]
-    python_code: str
-
-
 @dataclass
 class PostgresFunctionArgument:
     argument_name: str
@@ -112,6 +128,51 @@ class PostgresFileResult:
 
 type PythonPostgresModuleLookup = dict[str, str]
 
+
+@dataclass
+class ScriptManifestEntry:
+    file_hash: str
+    generated_file: Optional[Path]
+    lookup_entries: list[tuple[str, str]]
+    dependencies: dict[str, Optional[str]]
+    postgres_types: list[PostgresType]
+    postgres_domains: list[PostgresDomain]
+    postgres_functions: list[PostgresFunction]
+
+
+@dataclass
+class ParsedScriptFile:
+    script_file: Path
+    module_name: str
+    postgres_types: list[PostgresType]
+    postgres_domains: list[PostgresDomain]
+    postgres_functions: list[PostgresFunction]
+
+
+@dataclass
+class ScriptEmitTask:
+    script_file: Path
+    module_name: str
+    python_postgres_module_lookup: PythonPostgresModuleLookup
+    postgres_types: list[PostgresType]
+    postgres_functions: list[PostgresFunction]
+
+
+@dataclass
+class ScriptManifest:
+    settings: dict[str, str]
+    entries: dict[str, ScriptManifestEntry]
+
+
+@dataclass
+class StageTiming:
+    stage_name: str
+    start_time: float
+    end_time: float
+    script_name: Optional[str]
+    process_id: int
+
+
 type PythonImportDict = dict[str, set[str]]
 
 
@@ -134,3 +195,4 @@ class PsycopgLoader(PythonableObject):
 class PsycopgDomainDetails:
     domain_name: str
     loader: Optional[PsycopgLoader]
+    binary_loader: PsycopgLoader
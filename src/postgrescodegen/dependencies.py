@@ -0,0 +1,134 @@
+from typing import Optional
+
+from postgrescodegen.classes import (
+    PostgresDomain,
+    PostgresFunction,
+    PostgresType,
+    PythonPostgresModuleLookup,
+    ScriptManifest,
+)
+from postgrescodegen.pgtypes import (
+    get_base_postgres_type_for_postgres_type,
+    is_user_defined_type,
+)
+from postgrescodegen.pytypes import get_base_python_type_for_postgres_type
+
+
+def get_referenced_python_names_for_postgres_types(
+    postgres_types: list[PostgresType],
+) -> set[str]:
+    postgres_type_names = [
+        postgres_type.get_name() for postgres_type in postgres_types
+    ]
+    referenced_python_names: set[str] = set()
+    for postgres_type in postgres_types:
+        for postgres_type_field in postgres_type.type_fields:
+            postgres_type_field_base_type = (
+                get_base_postgres_type_for_postgres_type(
+                    postgres_type_field.field_type
+                )
+            )
+            if (
+                is_user_defined_type(postgres_type_field_base_type)
+                and postgres_type_field_base_type not in postgres_type_names
+            ):
+                referenced_python_names.add(
+                    get_base_python_type_for_postgres_type(
+                        postgres_type_field_base_type
+                    )
+                )
+    return referenced_python_names
+
+
+def get_referenced_python_names_for_postgres_domains(
+    postgres_domains: list[PostgresDomain],
+    postgres_types: list[PostgresType],
+) -> set[str]:
+    postgres_type_names = [
+        postgres_type.get_name() for postgres_type in postgres_types
+    ]
+    return {
+        get_base_python_type_for_postgres_type(postgres_domain.underlying_type)
+        for postgres_domain in postgres_domains
+        if is_user_defined_type(postgres_domain.underlying_type)
+        and postgres_domain.underlying_type not in postgres_type_names
+    }
+
+
+def get_referenced_python_names_for_postgres_functions(
+    postgres_functions: list[PostgresFunction],
+) -> set[str]:
+    referenced_python_names: set[str] = set()
+    for postgres_function in postgres_functions:
+        postgres_type_names = [postgres_function.function_return] + [
+            function_arg.argument_type
+            for function_arg in postgres_function.function_args
+        ]
+        for postgres_type_name in postgres_type_names:
+            if is_user_defined_type(postgres_type_name):
+                referenced_python_names.add(
+                    get_base_python_type_for_postgres_type(postgres_type_name)
+                )
+    return referenced_python_names
+
+
+def get_resolved_dependencies(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    referenced_python_names: set[str],
+) -> dict[str, Optional[str]]:
+    return {
+        python_name: python_postgres_module_lookup.get(python_name)
+        for python_name in sorted(referenced_python_names)
+    }
+
+
+def get_lookup_for_resolved_dependencies(
+    dependencies: dict[str, Optional[str]],
+) -> PythonPostgresModuleLookup:
+    return {
+        python_name: module_name
+        for python_name, module_name in dependencies.items()
+        if module_name is not None
+    }
+
+
+def are_dependencies_resolved_identically(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    dependencies: dict[str, Optional[str]],
+) -> bool:
+    return all(
+        python_postgres_module_lookup.get(python_name) == module_name
+        for python_name, module_name in dependencies.items()
+    )
+
+
+def get_script_dependents_graph(
+    manifest: ScriptManifest,
+) -> dict[str, set[str]]:
+    providers: dict[str, set[str]] = {}
+    for manifest_key, entry in manifest.entries.items():
+        for python_name, _ in entry.lookup_entries:
+            providers.setdefault(python_name, set()).add(manifest_key)
+    dependents: dict[str, set[str]] = {
+        manifest_key: set() for manifest_key in manifest.entries
+    }
+    for manifest_key, entry in manifest.entries.items():
+        for python_name in entry.dependencies:
+            for provider_key in providers.get(python_name, set()):
+                if provider_key != manifest_key:
+                    dependents[provider_key].add(manifest_key)
+    return dependents
+
+
+def get_affected_script_keys(
+    dependents: dict[str, set[str]], changed_script_keys: set[str]
+) -> set[str]:
+    affected_script_keys = set(changed_script_keys)
+    keys_to_visit = list(changed_script_keys)
+    while len(keys_to_visit) > 0:
+        manifest_key = keys_to_visit.pop()
+        for dependent_key in dependents.get(manifest_key, set()):
+            if dependent_key not in affected_script_keys:
+                affected_script_keys.add(dependent_key)
+                keys_to_visit.append(dependent_key)
+    return affected_script_keys
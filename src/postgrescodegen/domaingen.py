@@ -1,6 +1,6 @@
 import re
 from typing import Optional
-from postgrescodegen.classes import PostgresDomain, PythonPostgresModuleLookup
+from postgrescodegen.classes import PostgresDomain
 
 domain_regex = r"CREATE DOMAIN (.*) AS ([A-z_]*) (?:.*)"
 
@@ -14,10 +14,3 @@ def get_postgres_domain_for_statement(
     postgres_domain_name = domain_matches.group(1)
     postgres_underlying_type_name = domain_matches.group(2)
     return PostgresDomain(postgres_domain_name, postgres_underlying_type_name)
-
-
-def get_python_code_for_postgres_domain(
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
-    postgres_domains: list[PostgresDomain],
-) -> str:
-    return ""
@@ -40,34 +40,77 @@ def is_directory_in_generated_files(generated_files: list[Path], dirname: str) -
 
 def clean_output_directory(
     python_package_path: Path, output_module: str, generated_files: list[Path]
-):
+) -> int:
     dest_module_path = get_path_for_module(
         python_package_path, output_module, is_leaf=False
     )
     print(f"Cleaning up old files in {dest_module_path}")
+    generated_file_set = set(generated_files)
+    removed_file_count = 0
     for dirname, _, files in os.walk(dest_module_path):
         if not is_directory_in_generated_files(generated_files, dirname):
             print(f"Removing directory {dirname}")
+            removed_file_count += sum(
+                len(directory_files)
+                for _, _, directory_files in os.walk(dirname)
+            )
             shutil.rmtree(dirname)
             continue
         for file in files:
             full_file_path = Path(dirname) / file
-            if full_file_path not in generated_files:
+            if full_file_path not in generated_file_set:
                 print(f"Removing file {full_file_path}")
                 os.remove(full_file_path)
+                removed_file_count += 1
+    return removed_file_count
+
+
+def get_python_file_path_for_module(
+    output_root_path: Path, module_name: str
+) -> Path:
+    relative_module_path = Path(
+        module_name.split(".", maxsplit=1)[1].replace(".", "/")
+    )
+    return output_root_path / f"{relative_module_path}.py"
+
+
+def is_file_content_unchanged(output_path: Path, file_contents: bytes) -> bool:
+    try:
+        if output_path.stat().st_size != len(file_contents):
+            return False
+        with open(output_path, "rb") as f:
+            return f.read() == file_contents
+    except FileNotFoundError:
+        return False
+
+
+def write_file_if_changed(output_path: Path, file_contents: bytes) -> bool:
+    if is_file_content_unchanged(output_path, file_contents):
+        return False
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = output_path.with_name(
+        f".{output_path.name}.{os.getpid()}.tmp"
+    )
+    try:
+        with open(temporary_path, "wb") as f:
+            f.write(file_contents)
+        os.replace(temporary_path, output_path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+    return True
 
 
 def write_python_file(
     output_root_path: Path, module_name: str, file_contents: str
-) -> Path:
-    relative_module_path = Path(module_name.split(".", maxsplit=1)[1].replace(".", "/"))
-    output_path = output_root_path / f"{relative_module_path}.py"
-    parent_directory = output_path.parent
-    parent_directory.mkdir(parents=True, exist_ok=True)
-    print(f"Writing {module_name} to {output_path}")
-    with open(output_path, "w+") as f:
-        f.write(file_contents)
-    return output_path
+) -> tuple[Path, bool]:
+    output_path = get_python_file_path_for_module(output_root_path, module_name)
+    is_written = write_file_if_changed(
+        output_path, file_contents.encode("utf-8")
+    )
+    if is_written:
+        print(f"Writing {module_name} to {output_path}")
+    return output_path, is_written
 
 
 def get_python_module_name_for_postgres_file(
@@ -95,7 +138,6 @@ def create_py_typed_files_in_directory(
     generated_files: list[Path] = []
     for root, _, _ in os.walk(python_output_module_path):
         py_typed_file = Path(root) / "py.typed"
-        with open(py_typed_file, "w") as _:
-            pass
+        write_file_if_changed(py_typed_file, b"")
         generated_files.append(py_typed_file)
     return generated_files
@@ -1,29 +1,35 @@
 import re
-from pathlib import Path
 from typing import Optional
 
 from postgrescodegen.classes import (
+    CodegenOptions,
     PostgresFunction,
     PostgresFunctionArgument,
     PythonImportDict,
-    PythonPostgresModule,
     PythonPostgresModuleLookup,
 )
 from postgrescodegen.generator import (
     get_import_statements_for_python_import_dict,
-    get_postgres_module_for_postgres_file,
     update_python_type_import_dict,
 )
 from postgrescodegen.pgtypes import (
     get_base_postgres_type_for_postgres_type,
+    is_postgres_array_type,
+    is_postgres_type_nullable,
     is_user_defined_type,
 )
+from postgrescodegen.pynames import (
+    get_python_to_tuple_function_name_for_postgres_type_name,
+)
 from postgrescodegen.pytypes import (
+    get_base_python_type_for_postgres_type,
     get_base_python_type_for_python_type,
     get_python_type_for_postgres_type,
 )
 
 tab = "    "
+transaction_modes = ["function", "caller"]
+row_factories = ["class", "tuple", "namedtuple", "columns"]
 postgres_function_regex = r"CREATE(?: OR REPLACE)? FUNCTION ([A-z_]*)(?: )?\((.*)\).*RETURNS(?: SETOF)? (.*?) LANGUAGE"
 
 
@@ -86,20 +92,50 @@ def get_python_function_argument_for_postgres_function_argument(
     return f"{python_argument_name} : {python_type}"
 
 
+def get_python_row_type_for_postgres_function(
+    postgres_function: PostgresFunction, row_factory: str
+) -> str:
+    python_return_type = get_python_type_for_postgres_type(
+        postgres_function.function_return
+    )
+    if len(python_return_type) > 9 and python_return_type[:9] == "Optional[":
+        python_return_type = python_return_type[9:-1]
+    if python_return_type == "None" or row_factory in ["class", "columns"]:
+        return python_return_type
+    if row_factory == "namedtuple":
+        return f"{python_return_type}Tuple"
+    return "tuple[Any, ...]"
+
+
+def get_python_row_factory_for_postgres_function(
+    postgres_function: PostgresFunction, row_factory: str
+) -> str:
+    python_row_type = get_python_row_type_for_postgres_function(
+        postgres_function, row_factory
+    )
+    if row_factory == "tuple":
+        return "tuple_row"
+    if row_factory == "namedtuple":
+        return f"args_row({python_row_type})"
+    return f"class_row({python_row_type})"
+
+
 def get_python_function_declaration_for_postgres_function(
-    postgres_function: PostgresFunction, fetchall: bool
+    postgres_function: PostgresFunction,
+    fetchall: bool,
+    is_async: bool,
+    row_factory: str,
 ) -> str:
     arguments = [
         get_python_function_argument_for_postgres_function_argument(argument)
         for argument in postgres_function.function_args
     ]
-    arguments = ["conn: Connection"] + arguments
+    connection_type = "AsyncConnection" if is_async else "Connection"
+    arguments = [f"conn: {connection_type}"] + arguments
     argument_string = f",\n{tab}".join(arguments)
-    return_type_string = get_python_type_for_postgres_type(
-        postgres_function.function_return
+    return_type_string = get_python_row_type_for_postgres_function(
+        postgres_function, row_factory
     )
-    if len(return_type_string) > 9 and return_type_string[:9] == "Optional[":
-        return_type_string = return_type_string[9:-1]
     if return_type_string == "None":
         return_type_string = "None"
         function_name = postgres_function.function_name
@@ -109,12 +145,59 @@ def get_python_function_declaration_for_postgres_function(
     else:
         return_type_string = f"Optional[{return_type_string}]"
         function_name = f"{postgres_function.function_name}_fetchone"
-    declaration = (
-        f"def {function_name}(\n{tab}{argument_string}\n) -> {return_type_string}:"
+    if is_async:
+        function_name = f"{function_name}_async"
+    function_keyword = "async def" if is_async else "def"
+    declaration = f"{function_keyword} {function_name}(\n{tab}{argument_string}\n) -> {return_type_string}:"
+    return declaration
+
+
+def get_python_iter_declaration_for_postgres_function(
+    postgres_function: PostgresFunction, is_async: bool, row_factory: str
+) -> str:
+    arguments = [
+        get_python_function_argument_for_postgres_function_argument(argument)
+        for argument in postgres_function.function_args
+    ]
+    connection_type = "AsyncConnection" if is_async else "Connection"
+    arguments = (
+        [f"conn: {connection_type}"] + arguments + ["itersize: int = 1000"]
     )
+    argument_string = f",\n{tab}".join(arguments)
+    row_type_string = get_python_row_type_for_postgres_function(
+        postgres_function, row_factory
+    )
+    function_name = f"{postgres_function.function_name}_iter"
+    if is_async:
+        function_name = f"{function_name}_async"
+        return_type_string = f"AsyncIterator[{row_type_string}]"
+    else:
+        return_type_string = f"Iterator[{row_type_string}]"
+    function_keyword = "async def" if is_async else "def"
+    declaration = f"{function_keyword} {function_name}(\n{tab}{argument_string}\n) -> {return_type_string}:"
     return declaration
 
 
+def get_python_variant_declaration_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    variant_name: str,
+    return_type_string: str,
+) -> str:
+    arguments = [
+        get_python_function_argument_for_postgres_function_argument(argument)
+        for argument in postgres_function.function_args
+    ]
+    connection_type = "AsyncConnection" if is_async else "Connection"
+    arguments = [f"conn: {connection_type}"] + arguments
+    argument_string = f",\n{tab}".join(arguments)
+    function_name = f"{postgres_function.function_name}_{variant_name}"
+    if is_async:
+        function_name = f"{function_name}_async"
+    function_keyword = "async def" if is_async else "def"
+    return f"{function_keyword} {function_name}(\n{tab}{argument_string}\n) -> {return_type_string}:"
+
+
 def get_python_list_of_tuples_for_list_of_dataclasses(
     postgres_function_arg: PostgresFunctionArgument,
 ) -> str:
@@ -123,7 +206,12 @@ def get_python_list_of_tuples_for_list_of_dataclasses(
             postgres_function_arg.argument_name
         )
     )
-    return f"[astuple(x) for x in {function_argname}]"
+    to_tuple_function_name = (
+        get_python_to_tuple_function_name_for_postgres_type_name(
+            postgres_function_arg.argument_type
+        )
+    )
+    return f"[{to_tuple_function_name}(x) for x in {function_argname}]"
 
 
 def get_python_tuple_for_dataclass(
@@ -134,7 +222,32 @@ def get_python_tuple_for_dataclass(
             postgres_function_arg.argument_name
         )
     )
-    return f"astuple({function_argname})"
+    to_tuple_function_name = (
+        get_python_to_tuple_function_name_for_postgres_type_name(
+            postgres_function_arg.argument_type
+        )
+    )
+    if is_postgres_type_nullable(postgres_function_arg.argument_type):
+        return f"{to_tuple_function_name}({function_argname}) if {function_argname} is not None else None"
+    return f"{to_tuple_function_name}({function_argname})"
+
+
+def get_python_db_input_expression(
+    postgres_function_arg: PostgresFunctionArgument,
+) -> str:
+    postgres_argument_type = get_base_postgres_type_for_postgres_type(
+        postgres_function_arg.argument_type
+    )
+    if not is_user_defined_type(postgres_argument_type):
+        return get_python_function_argument_name_for_postgres_function_argument_name(
+            postgres_function_arg.argument_name
+        )
+    elif "[]" in postgres_function_arg.argument_type:
+        return get_python_list_of_tuples_for_list_of_dataclasses(
+            postgres_function_arg
+        )
+    else:
+        return get_python_tuple_for_dataclass(postgres_function_arg)
 
 
 def get_python_db_inputs(
@@ -143,122 +256,234 @@ def get_python_db_inputs(
     lines: list[str] = []
     for postgres_function_arg in postgres_function_args:
         db_argument_name = postgres_function_arg.argument_name
-        python_argument_name = (
-            get_python_function_argument_name_for_postgres_function_argument_name(
-                postgres_function_arg.argument_name
-            )
-        )
-        postgres_argument_type = get_base_postgres_type_for_postgres_type(
-            postgres_function_arg.argument_type
-        )
-        if not is_user_defined_type(postgres_argument_type):
-            tuple_expression = python_argument_name
-        elif "[]" in postgres_function_arg.argument_type:
-            tuple_expression = get_python_list_of_tuples_for_list_of_dataclasses(
-                postgres_function_arg
-            )
-        else:
-            tuple_expression = get_python_tuple_for_dataclass(postgres_function_arg)
+        tuple_expression = get_python_db_input_expression(postgres_function_arg)
         db_input_line = f"{base_indent * tab}{db_argument_name} = {tuple_expression}"
         lines.append(db_input_line)
     return "\n".join(lines)
 
 
+def get_python_cursor_arguments(
+    python_row_factory: str, is_binary: bool
+) -> str:
+    if is_binary:
+        return f"row_factory={python_row_factory}, binary=True"
+    return f"row_factory={python_row_factory}"
+
+
 def get_python_cursor_initialisation_for_postgres_function(
-    postgres_function: PostgresFunction, base_indent: int
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_binary: bool,
+    row_factory: str,
+    base_indent: int,
 ) -> str:
-    python_return_type = get_python_type_for_postgres_type(
-        postgres_function.function_return
+    python_row_factory = get_python_row_factory_for_postgres_function(
+        postgres_function, row_factory
     )
-    if len(python_return_type) > 9 and python_return_type[:9] == "Optional[":
-        python_return_type = python_return_type[9:-1]
-    return f"{base_indent * tab}with conn.cursor(row_factory=class_row({python_return_type})) as cur:"
+    cursor_arguments = get_python_cursor_arguments(
+        python_row_factory, is_binary
+    )
+    with_keyword = "async with" if is_async else "with"
+    return f"{base_indent * tab}{with_keyword} conn.cursor({cursor_arguments}) as cur:"
+
+
+def get_python_named_cursor_initialisation_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_binary: bool,
+    row_factory: str,
+    base_indent: int,
+) -> str:
+    python_row_factory = get_python_row_factory_for_postgres_function(
+        postgres_function, row_factory
+    )
+    cursor_name = f"{postgres_function.function_name}_iter"
+    cursor_arguments = get_python_cursor_arguments(
+        python_row_factory, is_binary
+    )
+    with_keyword = "async with" if is_async else "with"
+    cursor_line = f'{base_indent * tab}{with_keyword} conn.cursor(f"{cursor_name}_{{uuid4().hex}}", {cursor_arguments}) as cur:'
+    itersize_line = f"{(base_indent + 1) * tab}cur.itersize = itersize"
+    return f"{cursor_line}\n{itersize_line}"
 
 
 def get_python_execution_for_postgres_function(
-    postgres_function: PostgresFunction, is_cursor: bool, base_indent: int
+    postgres_function: PostgresFunction,
+    is_cursor: bool,
+    is_async: bool,
+    is_prepared: bool,
+    base_indent: int,
+    is_copied: bool = False,
 ) -> str:
     argument_placeholder_string = ", ".join(
-        ["%s"] * len(postgres_function.function_args)
+        (
+            f"ARRAY(SELECT copy_value FROM {get_python_copy_table_name(postgres_function, function_arg)} ORDER BY copy_ordinal)"
+            if is_copied
+            and is_postgres_function_argument_copyable(function_arg)
+            else "%s"
+        )
+        for function_arg in postgres_function.function_args
     )
     argument_names = [
-        function_arg.argument_name for function_arg in postgres_function.function_args
+        function_arg.argument_name
+        for function_arg in postgres_function.function_args
+        if not (
+            is_copied and is_postgres_function_argument_copyable(function_arg)
+        )
     ]
     variable_assignment = "rows = " if is_cursor else ""
     executing_object = "cur" if is_cursor else "conn"
+    await_keyword = get_python_await(is_async)
     argument_list_string = f"[{', '.join(argument_names)}]"
-    execute_line = (
-        f"{base_indent * tab}{variable_assignment}{executing_object}.execute("
-    )
+    execute_line = f"{base_indent * tab}{variable_assignment}{await_keyword}{executing_object}.execute("
     select_line = f'{(base_indent + 1) * tab}"SELECT * FROM {postgres_function.function_name}({argument_placeholder_string})",'
-    argument_line = f"{(base_indent + 1) * tab}{argument_list_string}"
     closing_bracket_lines = f"{base_indent * tab})"
-    lines = [execute_line, select_line, argument_line, closing_bracket_lines]
+    if is_prepared:
+        argument_line = f"{(base_indent + 1) * tab}{argument_list_string},"
+        prepare_line = f"{(base_indent + 1) * tab}prepare=True"
+        lines = [
+            execute_line,
+            select_line,
+            argument_line,
+            prepare_line,
+            closing_bracket_lines,
+        ]
+    else:
+        argument_line = f"{(base_indent + 1) * tab}{argument_list_string}"
+        lines = [
+            execute_line,
+            select_line,
+            argument_line,
+            closing_bracket_lines,
+        ]
     return "\n".join(lines)
 
 
-def get_python_fetchone(base_indent: int) -> str:
-    return f"{base_indent * tab}return rows.fetchone()"
+def get_python_await(is_async: bool) -> str:
+    return "await " if is_async else ""
+
 
+def get_python_fetchone(is_async: bool, base_indent: int) -> str:
+    return (
+        f"{base_indent * tab}return {get_python_await(is_async)}rows.fetchone()"
+    )
+
+
+def get_python_fetchall(is_async: bool, base_indent: int) -> str:
+    return (
+        f"{base_indent * tab}return {get_python_await(is_async)}rows.fetchall()"
+    )
 
-def get_python_fetchall(base_indent: int) -> str:
-    return f"{base_indent * tab}return rows.fetchall()"
+
+def get_python_yield_rows(is_async: bool, base_indent: int) -> str:
+    if is_async:
+        return f"{base_indent * tab}async for row in rows:\n{(base_indent + 1) * tab}yield row"
+    return f"{base_indent * tab}yield from rows"
+
+
+def get_python_return_columns(base_indent: int) -> str:
+    lines = [
+        f"{base_indent * tab}column_names = [column.name for column in cur.description or []]",
+        f"{base_indent * tab}if len(records) == 0:",
+        f"{(base_indent + 1) * tab}return {{column_name: [] for column_name in column_names}}",
+        f"{base_indent * tab}return dict(zip(column_names, map(list, zip(*records))))",
+    ]
+    return "\n".join(lines)
 
 
 def get_python_try(base_indent: int) -> str:
     return f"{base_indent * tab}try:"
 
 
-def get_python_except(base_indent: int) -> str:
+def get_python_except(is_async: bool, base_indent: int) -> str:
     except_line = f"{base_indent * tab}except:"
-    rollback_line = f"{(base_indent + 1) * tab}conn.rollback()"
+    rollback_line = (
+        f"{(base_indent + 1) * tab}{get_python_await(is_async)}conn.rollback()"
+    )
     raise_line = f"{(base_indent + 1) * tab}raise"
     return f"{except_line}\n{rollback_line}\n{raise_line}"
 
 
-def get_python_commit(base_indent: int) -> str:
-    return f"{base_indent * tab}conn.commit()"
+def get_python_commit(is_async: bool, base_indent: int) -> str:
+    return f"{base_indent * tab}{get_python_await(is_async)}conn.commit()"
+
+
+def get_python_body_indent(is_transaction_managed: bool) -> int:
+    return 2 if is_transaction_managed else 1
 
 
 def get_python_code_for_postgres_function(
-    postgres_function: PostgresFunction, fetchall: bool
+    postgres_function: PostgresFunction,
+    fetchall: bool,
+    is_async: bool,
+    is_prepared: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+    row_factory: str,
 ) -> str:
-    python_function_declaration = get_python_function_declaration_for_postgres_function(
-        postgres_function, fetchall
+    python_function_declaration = (
+        get_python_function_declaration_for_postgres_function(
+            postgres_function, fetchall, is_async, row_factory
+        )
     )
     python_db_inputs = get_python_db_inputs(
         postgres_function.function_args, base_indent=1
     )
-    python_try = get_python_try(base_indent=1)
+    body_indent = get_python_body_indent(is_transaction_managed)
     if postgres_function.function_return == "VOID":
         python_conn_execution = get_python_execution_for_postgres_function(
-            postgres_function, is_cursor=False, base_indent=2
+            postgres_function,
+            is_cursor=False,
+            is_async=is_async,
+            is_prepared=is_prepared,
+            base_indent=body_indent,
         )
-        python_commit = get_python_commit(base_indent=2)
-        python_execution = "\n".join([python_conn_execution, python_commit])
+        python_execution_lines = [python_conn_execution]
+        if is_transaction_managed:
+            python_execution_lines.append(
+                get_python_commit(is_async, base_indent=body_indent)
+            )
     else:
         python_cursor_initialisation = (
             get_python_cursor_initialisation_for_postgres_function(
-                postgres_function, base_indent=2
+                postgres_function,
+                is_async,
+                is_binary,
+                row_factory,
+                base_indent=body_indent,
             )
         )
         python_cursor_execution = get_python_execution_for_postgres_function(
-            postgres_function, is_cursor=True, base_indent=3
+            postgres_function,
+            is_cursor=True,
+            is_async=is_async,
+            is_prepared=is_prepared,
+            base_indent=body_indent + 1,
         )
         if fetchall:
-            python_result_fetching = get_python_fetchall(base_indent=3)
+            python_result_fetching = get_python_fetchall(
+                is_async, base_indent=body_indent + 1
+            )
         else:
-            python_result_fetching = get_python_fetchone(base_indent=3)
-        python_commit = get_python_commit(base_indent=3)
-        python_execution = "\n".join(
-            [
-                python_cursor_initialisation,
-                python_cursor_execution,
-                python_commit,
-                python_result_fetching,
-            ]
-        )
-    python_except = get_python_except(base_indent=1)
+            python_result_fetching = get_python_fetchone(
+                is_async, base_indent=body_indent + 1
+            )
+        python_execution_lines = [
+            python_cursor_initialisation,
+            python_cursor_execution,
+        ]
+        if is_transaction_managed:
+            python_execution_lines.append(
+                get_python_commit(is_async, base_indent=body_indent + 1)
+            )
+        python_execution_lines.append(python_result_fetching)
+    python_execution = "\n".join(python_execution_lines)
+    if is_transaction_managed:
+        python_try = get_python_try(base_indent=1)
+        python_except = get_python_except(is_async, base_indent=1)
+    else:
+        python_try = ""
+        python_except = ""
     return "\n".join(
         [
             line
@@ -274,6 +499,476 @@ def get_python_code_for_postgres_function(
     )
 
 
+def get_python_iter_code_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+    row_factory: str,
+) -> str:
+    python_function_declaration = (
+        get_python_iter_declaration_for_postgres_function(
+            postgres_function, is_async, row_factory
+        )
+    )
+    python_db_inputs = get_python_db_inputs(
+        postgres_function.function_args, base_indent=1
+    )
+    body_indent = get_python_body_indent(is_transaction_managed)
+    python_execution = "\n".join(
+        [
+            get_python_named_cursor_initialisation_for_postgres_function(
+                postgres_function,
+                is_async,
+                is_binary,
+                row_factory,
+                base_indent=body_indent,
+            ),
+            get_python_execution_for_postgres_function(
+                postgres_function,
+                is_cursor=True,
+                is_async=is_async,
+                is_prepared=False,
+                base_indent=body_indent + 1,
+            ),
+            get_python_yield_rows(is_async, base_indent=body_indent + 1),
+        ]
+    )
+    if not is_transaction_managed:
+        python_lines = [
+            python_function_declaration,
+            python_db_inputs,
+            python_execution,
+        ]
+    else:
+        python_lines = [
+            python_function_declaration,
+            python_db_inputs,
+            get_python_try(base_indent=1),
+            python_execution,
+            get_python_commit(is_async, base_indent=body_indent),
+            get_python_except(is_async, base_indent=1),
+        ]
+    return "\n".join([line for line in python_lines if line != ""])
+
+
+def get_python_tuple_cursor_code_for_postgres_function(
+    postgres_function: PostgresFunction,
+    python_function_declaration: str,
+    python_result_fetching: str,
+    python_result_returning: str,
+    is_async: bool,
+    is_prepared: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+) -> str:
+    python_db_inputs = get_python_db_inputs(
+        postgres_function.function_args, base_indent=1
+    )
+    body_indent = get_python_body_indent(is_transaction_managed)
+    cursor_arguments = get_python_cursor_arguments("tuple_row", is_binary)
+    with_keyword = "async with" if is_async else "with"
+    python_execution_lines = [
+        f"{body_indent * tab}{with_keyword} conn.cursor({cursor_arguments}) as cur:",
+        get_python_execution_for_postgres_function(
+            postgres_function,
+            is_cursor=True,
+            is_async=is_async,
+            is_prepared=is_prepared,
+            base_indent=body_indent + 1,
+        ),
+        python_result_fetching,
+    ]
+    if is_transaction_managed:
+        python_execution_lines.append(
+            get_python_commit(is_async, base_indent=body_indent + 1)
+        )
+    python_execution_lines.append(python_result_returning)
+    python_execution = "\n".join(python_execution_lines)
+    if not is_transaction_managed:
+        python_lines = [
+            python_function_declaration,
+            python_db_inputs,
+            python_execution,
+        ]
+    else:
+        python_lines = [
+            python_function_declaration,
+            python_db_inputs,
+            get_python_try(base_indent=1),
+            python_execution,
+            get_python_except(is_async, base_indent=1),
+        ]
+    return "\n".join([line for line in python_lines if line != ""])
+
+
+def get_python_fetch_columns_code_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_prepared: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+) -> str:
+    result_indent = get_python_body_indent(is_transaction_managed) + 1
+    return get_python_tuple_cursor_code_for_postgres_function(
+        postgres_function,
+        get_python_variant_declaration_for_postgres_function(
+            postgres_function, is_async, "fetch_columns", "dict[str, list[Any]]"
+        ),
+        f"{result_indent * tab}records = {get_python_await(is_async)}rows.fetchall()",
+        get_python_return_columns(result_indent),
+        is_async,
+        is_prepared,
+        is_transaction_managed,
+        is_binary,
+    )
+
+
+def get_python_arrays_function_name_for_postgres_function(
+    postgres_function: PostgresFunction,
+) -> str:
+    postgres_type_name = get_base_postgres_type_for_postgres_type(
+        postgres_function.function_return
+    )
+    return f"get_{postgres_type_name.lower()}_arrays"
+
+
+def get_python_fetch_arrays_code_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_prepared: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+) -> str:
+    result_indent = get_python_body_indent(is_transaction_managed) + 1
+    arrays_function_name = (
+        get_python_arrays_function_name_for_postgres_function(postgres_function)
+    )
+    if is_async:
+        python_result_fetching = "\n".join(
+            [
+                f"{result_indent * tab}records = await rows.fetchall()",
+                f"{result_indent * tab}arrays = {arrays_function_name}(records, len(records))",
+            ]
+        )
+    else:
+        python_result_fetching = f"{result_indent * tab}arrays = {arrays_function_name}(rows, rows.rowcount)"
+    return get_python_tuple_cursor_code_for_postgres_function(
+        postgres_function,
+        get_python_variant_declaration_for_postgres_function(
+            postgres_function,
+            is_async,
+            "fetch_arrays",
+            "dict[str, numpy.ndarray]",
+        ),
+        python_result_fetching,
+        f"{result_indent * tab}return arrays",
+        is_async,
+        is_prepared,
+        is_transaction_managed,
+        is_binary,
+    )
+
+
+def is_postgres_function_arrays_capable(
+    postgres_function: PostgresFunction,
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+) -> bool:
+    if is_postgres_array_type(
+        postgres_function.function_return
+    ) or not is_user_defined_type(postgres_function.function_return):
+        return False
+    base_python_type = get_base_python_type_for_python_type(
+        get_python_type_for_postgres_type(postgres_function.function_return)
+    )
+    return python_postgres_module_lookup.get(base_python_type) is not None
+
+
+def get_python_copy_table_name(
+    postgres_function: PostgresFunction,
+    postgres_function_arg: PostgresFunctionArgument,
+) -> str:
+    return f"postgrescodegen_copy_{postgres_function.function_name}_{postgres_function_arg.argument_name}".lower()
+
+
+def is_postgres_function_argument_copyable(
+    postgres_function_arg: PostgresFunctionArgument,
+) -> bool:
+    return is_postgres_array_type(
+        postgres_function_arg.argument_type
+    ) and is_user_defined_type(postgres_function_arg.argument_type)
+
+
+def is_postgres_function_copy_capable(
+    postgres_function: PostgresFunction,
+) -> bool:
+    return any(
+        is_postgres_function_argument_copyable(function_arg)
+        for function_arg in postgres_function.function_args
+    )
+
+
+def get_python_copy_declaration_for_postgres_function(
+    postgres_function: PostgresFunction, is_async: bool, row_factory: str
+) -> str:
+    arguments = [
+        (
+            f"{get_python_function_argument_name_for_postgres_function_argument_name(argument.argument_name)} : Iterable[{get_base_python_type_for_postgres_type(argument.argument_type)}]"
+            if is_postgres_function_argument_copyable(argument)
+            else get_python_function_argument_for_postgres_function_argument(
+                argument
+            )
+        )
+        for argument in postgres_function.function_args
+    ]
+    connection_type = "AsyncConnection" if is_async else "Connection"
+    arguments = [f"conn: {connection_type}"] + arguments
+    argument_string = f",\n{tab}".join(arguments)
+    return_type_string = get_python_row_type_for_postgres_function(
+        postgres_function, row_factory
+    )
+    if return_type_string != "None":
+        return_type_string = f"list[{return_type_string}]"
+    function_name = f"{postgres_function.function_name}_copy"
+    if is_async:
+        function_name = f"{function_name}_async"
+    function_keyword = "async def" if is_async else "def"
+    return f"{function_keyword} {function_name}(\n{tab}{argument_string}\n) -> {return_type_string}:"
+
+
+def get_python_copy_for_postgres_function_argument(
+    postgres_function: PostgresFunction,
+    postgres_function_arg: PostgresFunctionArgument,
+    is_async: bool,
+    is_binary: bool,
+    base_indent: int,
+) -> str:
+    table_name = get_python_copy_table_name(
+        postgres_function, postgres_function_arg
+    )
+    to_tuple_function_name = (
+        get_python_to_tuple_function_name_for_postgres_type_name(
+            postgres_function_arg.argument_type
+        )
+    )
+    element_type = postgres_function_arg.argument_type[:-2]
+    python_argument_name = (
+        get_python_function_argument_name_for_postgres_function_argument_name(
+            postgres_function_arg.argument_name
+        )
+    )
+    with_keyword = "async with" if is_async else "with"
+    await_keyword = get_python_await(is_async)
+    lines = [
+        f'{base_indent * tab}{await_keyword}cur.execute("CREATE TEMP TABLE IF NOT EXISTS {table_name} (copy_ordinal bigint, copy_value {element_type}); TRUNCATE {table_name}")',
+    ]
+    if is_binary:
+        lines.extend(
+            [
+                f'{base_indent * tab}{with_keyword} cur.copy("COPY {table_name} (copy_ordinal, copy_value) FROM STDIN (FORMAT BINARY)") as copy:',
+                f'{(base_indent + 1) * tab}copy.set_types(["int8", "{element_type.lower()}"])',
+                f"{(base_indent + 1) * tab}for copy_ordinal, copy_value in enumerate({python_argument_name}):",
+                f"{(base_indent + 2) * tab}{await_keyword}copy.write_row((copy_ordinal, copy_value))",
+            ]
+        )
+    else:
+        lines.extend(
+            [
+                f'{base_indent * tab}{with_keyword} cur.copy("COPY {table_name} (copy_ordinal, copy_value) FROM STDIN") as copy:',
+                f"{(base_indent + 1) * tab}for copy_ordinal, copy_value in enumerate({python_argument_name}):",
+                f"{(base_indent + 2) * tab}{await_keyword}copy.write_row((copy_ordinal, {to_tuple_function_name}(copy_value)))",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def get_python_copy_code_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+    row_factory: str,
+) -> str:
+    python_function_declaration = (
+        get_python_copy_declaration_for_postgres_function(
+            postgres_function, is_async, row_factory
+        )
+    )
+    python_db_inputs = get_python_db_inputs(
+        [
+            function_arg
+            for function_arg in postgres_function.function_args
+            if not is_postgres_function_argument_copyable(function_arg)
+        ],
+        base_indent=1,
+    )
+    body_indent = get_python_body_indent(is_transaction_managed)
+    with_keyword = "async with" if is_async else "with"
+    python_execution_lines = [
+        f"{body_indent * tab}{with_keyword} conn.cursor() as cur:",
+        *[
+            get_python_copy_for_postgres_function_argument(
+                postgres_function,
+                function_arg,
+                is_async,
+                is_binary,
+                base_indent=body_indent + 1,
+            )
+            for function_arg in postgres_function.function_args
+            if is_postgres_function_argument_copyable(function_arg)
+        ],
+    ]
+    if postgres_function.function_return == "VOID":
+        python_execution_lines.append(
+            get_python_execution_for_postgres_function(
+                postgres_function,
+                is_cursor=False,
+                is_async=is_async,
+                is_prepared=False,
+                base_indent=body_indent,
+                is_copied=True,
+            )
+        )
+        if is_transaction_managed:
+            python_execution_lines.append(
+                get_python_commit(is_async, base_indent=body_indent)
+            )
+    else:
+        python_execution_lines.extend(
+            [
+                get_python_cursor_initialisation_for_postgres_function(
+                    postgres_function,
+                    is_async,
+                    is_binary,
+                    row_factory,
+                    base_indent=body_indent,
+                ),
+                get_python_execution_for_postgres_function(
+                    postgres_function,
+                    is_cursor=True,
+                    is_async=is_async,
+                    is_prepared=False,
+                    base_indent=body_indent + 1,
+                    is_copied=True,
+                ),
+            ]
+        )
+        if is_transaction_managed:
+            python_execution_lines.append(
+                get_python_commit(is_async, base_indent=body_indent + 1)
+            )
+        python_execution_lines.append(
+            get_python_fetchall(is_async, base_indent=body_indent + 1)
+        )
+    python_execution = "\n".join(python_execution_lines)
+    if not is_transaction_managed:
+        python_lines = [
+            python_function_declaration,
+            python_db_inputs,
+            python_execution,
+        ]
+    else:
+        python_lines = [
+            python_function_declaration,
+            python_db_inputs,
+            get_python_try(base_indent=1),
+            python_execution,
+            get_python_except(is_async, base_indent=1),
+        ]
+    return "\n".join([line for line in python_lines if line != ""])
+
+
+def get_python_executemany_declaration_for_postgres_function(
+    postgres_function: PostgresFunction, is_async: bool
+) -> str:
+    argument_types = ", ".join(
+        get_python_type_for_postgres_type(argument.argument_type)
+        for argument in postgres_function.function_args
+    )
+    connection_type = "AsyncConnection" if is_async else "Connection"
+    function_name = f"{postgres_function.function_name}_executemany"
+    if is_async:
+        function_name = f"{function_name}_async"
+    function_keyword = "async def" if is_async else "def"
+    arguments = [
+        f"conn: {connection_type}",
+        f"arguments: Iterable[tuple[{argument_types}]]",
+    ]
+    argument_string = f",\n{tab}".join(arguments)
+    return f"{function_keyword} {function_name}(\n{tab}{argument_string}\n) -> None:"
+
+
+def get_python_executemany_for_postgres_function(
+    postgres_function: PostgresFunction, is_async: bool, base_indent: int
+) -> str:
+    argument_placeholder_string = ", ".join(
+        ["%s"] * len(postgres_function.function_args)
+    )
+    python_argument_names = [
+        get_python_function_argument_name_for_postgres_function_argument_name(
+            function_arg.argument_name
+        )
+        for function_arg in postgres_function.function_args
+    ]
+    if len(python_argument_names) == 1:
+        unpacking_target = f"({python_argument_names[0]},)"
+    else:
+        unpacking_target = f"({', '.join(python_argument_names)})"
+    db_input_expressions = ", ".join(
+        get_python_db_input_expression(function_arg)
+        for function_arg in postgres_function.function_args
+    )
+    with_keyword = "async with" if is_async else "with"
+    await_keyword = get_python_await(is_async)
+    lines = [
+        f"{base_indent * tab}{with_keyword} conn.cursor() as cur:",
+        f"{(base_indent + 1) * tab}{await_keyword}cur.executemany(",
+        f'{(base_indent + 2) * tab}"SELECT * FROM {postgres_function.function_name}({argument_placeholder_string})",',
+        f"{(base_indent + 2) * tab}(",
+        f"{(base_indent + 3) * tab}[{db_input_expressions}]",
+        f"{(base_indent + 3) * tab}for {unpacking_target} in arguments",
+        f"{(base_indent + 2) * tab}),",
+        f"{(base_indent + 1) * tab})",
+    ]
+    return "\n".join(lines)
+
+
+def get_python_executemany_code_for_postgres_function(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_transaction_managed: bool,
+) -> str:
+    python_function_declaration = (
+        get_python_executemany_declaration_for_postgres_function(
+            postgres_function, is_async
+        )
+    )
+    body_indent = get_python_body_indent(is_transaction_managed)
+    python_execution = get_python_executemany_for_postgres_function(
+        postgres_function, is_async, base_indent=body_indent
+    )
+    if not is_transaction_managed:
+        return f"{python_function_declaration}\n{python_execution}"
+    return "\n".join(
+        [
+            python_function_declaration,
+            get_python_try(base_indent=1),
+            python_execution,
+            get_python_commit(is_async, base_indent=body_indent),
+            get_python_except(is_async, base_indent=1),
+        ]
+    )
+
+
+def is_postgres_function_executemany_capable(
+    postgres_function: PostgresFunction,
+) -> bool:
+    return (
+        postgres_function.function_return == "VOID"
+        and len(postgres_function.function_args) > 0
+    )
+
+
 def get_import_for_postgres_type(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     python_imports_dict: dict[str, set[str]],
@@ -296,26 +991,86 @@ def get_import_for_postgres_type(
         )
     if "list[" in python_type_name:
         python_type_name = python_type_name[5:-1]
-    if is_user_defined_type(postgres_type_name) and is_argument:
-        python_imports_dict = update_python_type_import_dict(
-            python_imports_dict, "dataclasses", "astuple"
-        )
     base_python_type = get_base_python_type_for_python_type(python_type_name)
     type_module = python_postgres_module_lookup.get(base_python_type)
     if type_module is not None:
         user_imports_dict = update_python_type_import_dict(
             user_imports_dict, type_module, base_python_type
         )
+        if is_user_defined_type(postgres_type_name) and is_argument:
+            user_imports_dict = update_python_type_import_dict(
+                user_imports_dict,
+                type_module,
+                get_python_to_tuple_function_name_for_postgres_type_name(
+                    postgres_type_name
+                ),
+            )
     return python_imports_dict, user_imports_dict
 
 
+def get_psycopg_row_factories(row_factory: str) -> list[str]:
+    if row_factory == "tuple":
+        return ["tuple_row"]
+    if row_factory == "namedtuple":
+        return ["args_row"]
+    if row_factory == "columns":
+        return ["class_row", "tuple_row"]
+    return ["class_row"]
+
+
+def get_imports_for_row_factory(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    python_imports_dict: PythonImportDict,
+    user_imports_dict: PythonImportDict,
+    postgres_function: PostgresFunction,
+    row_factory: str,
+) -> tuple[PythonImportDict, PythonImportDict]:
+    if row_factory in ["tuple", "columns"]:
+        python_imports_dict = update_python_type_import_dict(
+            python_imports_dict, "typing", "Any"
+        )
+    if row_factory == "namedtuple":
+        base_python_type = get_base_python_type_for_python_type(
+            get_python_type_for_postgres_type(postgres_function.function_return)
+        )
+        type_module = python_postgres_module_lookup.get(base_python_type)
+        if type_module is not None:
+            user_imports_dict = update_python_type_import_dict(
+                user_imports_dict, type_module, f"{base_python_type}Tuple"
+            )
+    return python_imports_dict, user_imports_dict
+
+
+def get_imports_for_arrays_function(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    user_imports_dict: PythonImportDict,
+    postgres_function: PostgresFunction,
+) -> PythonImportDict:
+    base_python_type = get_base_python_type_for_python_type(
+        get_python_type_for_postgres_type(postgres_function.function_return)
+    )
+    type_module = python_postgres_module_lookup.get(base_python_type)
+    if type_module is not None:
+        user_imports_dict = update_python_type_import_dict(
+            user_imports_dict,
+            type_module,
+            get_python_arrays_function_name_for_postgres_function(
+                postgres_function
+            ),
+        )
+    return user_imports_dict
+
+
 def get_imports_for_postgres_function_file(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_functions: list[PostgresFunction],
+    codegen_options: CodegenOptions,
 ) -> str:
     non_void_returning_function = False
     python_imports_dict: dict[str, set[str]] = {}
     user_imports_dict: dict[str, set[str]] = {}
+    psycopg_row_factories: set[str] = set()
+    arrays_function = False
     for postgres_function in postgres_functions:
         python_imports_dict, user_imports_dict = get_import_for_postgres_type(
             python_postgres_module_lookup,
@@ -326,6 +1081,36 @@ def get_imports_for_postgres_function_file(
         )
         if postgres_function.function_return != "VOID":
             non_void_returning_function = True
+            row_factory = get_postgres_function_row_factory(
+                postgres_function, codegen_options
+            )
+            python_imports_dict, user_imports_dict = (
+                get_imports_for_row_factory(
+                    python_postgres_module_lookup,
+                    python_imports_dict,
+                    user_imports_dict,
+                    postgres_function,
+                    row_factory,
+                )
+            )
+            psycopg_row_factories.update(get_psycopg_row_factories(row_factory))
+        if codegen_options.arrays and is_postgres_function_arrays_capable(
+            postgres_function, python_postgres_module_lookup
+        ):
+            arrays_function = True
+            psycopg_row_factories.add("tuple_row")
+            user_imports_dict = get_imports_for_arrays_function(
+                python_postgres_module_lookup,
+                user_imports_dict,
+                postgres_function,
+            )
+        if is_postgres_function_executemany_capable(postgres_function) or (
+            codegen_options.copy
+            and is_postgres_function_copy_capable(postgres_function)
+        ):
+            python_imports_dict = update_python_type_import_dict(
+                python_imports_dict, "typing", "Iterable"
+            )
         for function_arg in postgres_function.function_args:
             python_imports_dict, user_imports_dict = get_import_for_postgres_type(
                 python_postgres_module_lookup,
@@ -335,11 +1120,29 @@ def get_imports_for_postgres_function_file(
                 True,
             )
     psycopg_imports = [
-        "from psycopg import Connection",
+        (
+            "from psycopg import AsyncConnection, Connection"
+            if codegen_options.generate_async
+            else "from psycopg import Connection"
+        ),
     ]
+    if arrays_function:
+        psycopg_imports.insert(0, "import numpy")
     if non_void_returning_function:
-        psycopg_imports.append("from psycopg.rows import class_row")
-        update_python_type_import_dict(python_imports_dict, "typing", "Optional")
+        psycopg_imports.append(
+            f"from psycopg.rows import {', '.join(sorted(psycopg_row_factories))}"
+        )
+        update_python_type_import_dict(
+            python_imports_dict, "typing", "Optional"
+        )
+        update_python_type_import_dict(
+            python_imports_dict, "typing", "Iterator"
+        )
+        update_python_type_import_dict(python_imports_dict, "uuid", "uuid4")
+        if codegen_options.generate_async:
+            update_python_type_import_dict(
+                python_imports_dict, "typing", "AsyncIterator"
+            )
     psycopg_imports_string = "\n".join(psycopg_imports)
     python_imports_string = get_import_statements_for_python_import_dict(
         python_imports_dict
@@ -360,39 +1163,170 @@ def get_imports_for_postgres_function_file(
     )
 
 
+def is_postgres_function_prepared(
+    postgres_function: PostgresFunction, codegen_options: CodegenOptions
+) -> bool:
+    return (
+        codegen_options.prepare
+        or postgres_function.function_name in codegen_options.prepare_functions
+    )
+
+
+def is_transaction_managed_by_functions(
+    codegen_options: CodegenOptions,
+) -> bool:
+    return codegen_options.transaction_mode == "function"
+
+
+def get_postgres_function_row_factory(
+    postgres_function: PostgresFunction, codegen_options: CodegenOptions
+) -> str:
+    row_factory = dict(codegen_options.row_factory_functions).get(
+        postgres_function.function_name, codegen_options.row_factory
+    )
+    if row_factory == "namedtuple" and not is_user_defined_type(
+        get_base_postgres_type_for_postgres_type(
+            postgres_function.function_return
+        )
+    ):
+        return "tuple"
+    return row_factory
+
+
+def get_python_code_for_postgres_function_variants(
+    postgres_function: PostgresFunction,
+    is_async: bool,
+    is_prepared: bool,
+    is_transaction_managed: bool,
+    is_binary: bool,
+    row_factory: str,
+    is_arrays: bool,
+    is_copied: bool,
+) -> list[str]:
+    python_functions: list[str] = []
+    if postgres_function.function_return != "VOID":
+        fetchall_function = get_python_code_for_postgres_function(
+            postgres_function,
+            fetchall=True,
+            is_async=is_async,
+            is_prepared=is_prepared,
+            is_transaction_managed=is_transaction_managed,
+            is_binary=is_binary,
+            row_factory=row_factory,
+        )
+        python_functions.append(fetchall_function)
+    fetchone_function = get_python_code_for_postgres_function(
+        postgres_function,
+        fetchall=False,
+        is_async=is_async,
+        is_prepared=is_prepared,
+        is_transaction_managed=is_transaction_managed,
+        is_binary=is_binary,
+        row_factory=row_factory,
+    )
+    python_functions.append(fetchone_function)
+    if postgres_function.function_return != "VOID":
+        iter_function = get_python_iter_code_for_postgres_function(
+            postgres_function,
+            is_async,
+            is_transaction_managed,
+            is_binary,
+            row_factory,
+        )
+        python_functions.append(iter_function)
+    if postgres_function.function_return != "VOID" and row_factory == "columns":
+        fetch_columns_function = (
+            get_python_fetch_columns_code_for_postgres_function(
+                postgres_function,
+                is_async,
+                is_prepared,
+                is_transaction_managed,
+                is_binary,
+            )
+        )
+        python_functions.append(fetch_columns_function)
+    if is_arrays:
+        fetch_arrays_function = (
+            get_python_fetch_arrays_code_for_postgres_function(
+                postgres_function,
+                is_async,
+                is_prepared,
+                is_transaction_managed,
+                is_binary,
+            )
+        )
+        python_functions.append(fetch_arrays_function)
+    if is_copied:
+        copy_function = get_python_copy_code_for_postgres_function(
+            postgres_function,
+            is_async,
+            is_transaction_managed,
+            is_binary,
+            row_factory,
+        )
+        python_functions.append(copy_function)
+    if is_postgres_function_executemany_capable(postgres_function):
+        executemany_function = (
+            get_python_executemany_code_for_postgres_function(
+                postgres_function, is_async, is_transaction_managed
+            )
+        )
+        python_functions.append(executemany_function)
+    return python_functions
+
+
 def get_python_code_for_postgres_functions(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_functions: list[PostgresFunction],
+    codegen_options: CodegenOptions,
 ) -> str:
     python_sections = [
         get_imports_for_postgres_function_file(
-            python_postgres_module_lookup, postgres_functions
+            python_postgres_module_lookup, postgres_functions, codegen_options
         )
     ]
+    is_transaction_managed = is_transaction_managed_by_functions(
+        codegen_options
+    )
     for postgres_function in postgres_functions:
-        if postgres_function.function_return != "VOID":
-            fetchall_function = get_python_code_for_postgres_function(
-                postgres_function, fetchall=True
+        is_prepared = is_postgres_function_prepared(
+            postgres_function, codegen_options
+        )
+        row_factory = get_postgres_function_row_factory(
+            postgres_function, codegen_options
+        )
+        is_arrays = (
+            codegen_options.arrays
+            and is_postgres_function_arrays_capable(
+                postgres_function, python_postgres_module_lookup
             )
-            python_sections.append(fetchall_function)
-        fetchone_function = get_python_code_for_postgres_function(
-            postgres_function, fetchall=False
         )
-        python_sections.append(fetchone_function)
+        is_copied = codegen_options.copy and is_postgres_function_copy_capable(
+            postgres_function
+        )
+        python_sections.extend(
+            get_python_code_for_postgres_function_variants(
+                postgres_function,
+                is_async=False,
+                is_prepared=is_prepared,
+                is_transaction_managed=is_transaction_managed,
+                is_binary=codegen_options.binary,
+                row_factory=row_factory,
+                is_arrays=is_arrays,
+                is_copied=is_copied,
+            )
+        )
+        if codegen_options.generate_async:
+            python_sections.extend(
+                get_python_code_for_postgres_function_variants(
+                    postgres_function,
+                    is_async=True,
+                    is_prepared=is_prepared,
+                    is_transaction_managed=is_transaction_managed,
+                    is_binary=codegen_options.binary,
+                    row_factory=row_factory,
+                    is_arrays=is_arrays,
+                    is_copied=is_copied,
+                )
+            )
     return "\n\n\n".join(python_sections)
-
-
-def get_python_postgres_module_for_postgres_function_file(
-    postgres_input_root_path: Path,
-    python_output_module: str,
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
-    file_path: Path,
-) -> tuple[PythonPostgresModuleLookup, PythonPostgresModule[PostgresFunction]]:
-    return get_postgres_module_for_postgres_file(
-        get_postgres_function_from_statement,
-        get_python_code_for_postgres_functions,
-        postgres_input_root_path,
-        python_output_module,
-        python_postgres_module_lookup,
-        file_path,
-    )
@@ -1,15 +1,12 @@
+import re
+
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
 
 from postgrescodegen.classes import (
     PythonImport,
     PythonImportDict,
     PythonablePostgresObject,
-    PythonPostgresModule,
-    PythonPostgresModuleLookup,
-)
-from postgrescodegen.files import (
-    get_python_module_name_for_postgres_file,
 )
 
 tab = "   "
@@ -55,18 +52,139 @@ def get_import_statements_for_python_imports(imports: list[PythonImport]) -> str
     return get_import_statements_for_python_import_dict(import_dict)
 
 
-def normalise_postgres_file_contents(file_contents: str) -> str:
-    one_line_contents = file_contents.replace("\n", " ")
-    space_normalised_contents = " ".join(one_line_contents.split())
-    return space_normalised_contents
+dollar_quote_regex = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+
+
+def get_postgres_token_regex(delimiter: str) -> re.Pattern[str]:
+    return re.compile(rf"--|/\*|'|\"|\$|{re.escape(delimiter)}")
+
+
+def is_identifier_character(character: str) -> bool:
+    return character.isalnum() or character in "_$"
+
+
+def get_block_comment_end(file_contents: str, comment_start: int) -> int:
+    depth = 0
+    position = comment_start
+    while True:
+        next_open = file_contents.find("/*", position)
+        next_close = file_contents.find("*/", position)
+        if next_close == -1:
+            return len(file_contents)
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            position = next_open + 2
+            continue
+        depth -= 1
+        position = next_close + 2
+        if depth == 0:
+            return position
+
+
+def get_quoted_end(
+    file_contents: str, quote_start: int, quote: str, is_escape_string: bool
+) -> int:
+    position = quote_start + 1
+    while True:
+        next_quote = file_contents.find(quote, position)
+        if next_quote == -1:
+            return len(file_contents)
+        if is_escape_string:
+            backslash_count = 0
+            while file_contents[next_quote - backslash_count - 1] == "\\":
+                backslash_count += 1
+            if backslash_count % 2 == 1:
+                position = next_quote + 1
+                continue
+        if file_contents.startswith(quote, next_quote + 1):
+            position = next_quote + 2
+            continue
+        return next_quote + 1
+
+
+def is_escape_string_start(file_contents: str, quote_start: int) -> bool:
+    return (
+        quote_start > 0
+        and file_contents[quote_start - 1] in "Ee"
+        and (
+            quote_start == 1
+            or not is_identifier_character(file_contents[quote_start - 2])
+        )
+    )
+
+
+def get_normalised_statement(statement_parts: list[str]) -> str:
+    return " ".join("".join(statement_parts).split())
+
+
+def iterate_statements_from_postgres_file_contents(
+    file_contents: str, delimiter: str = ";"
+) -> Iterator[str]:
+    token_regex = get_postgres_token_regex(delimiter)
+    statement_parts: list[str] = []
+    position = 0
+    while True:
+        token_match = token_regex.search(file_contents, position)
+        if token_match is None:
+            statement_parts.append(file_contents[position:])
+            break
+        token_start = token_match.start()
+        token = token_match.group()
+        if token_start > position:
+            statement_parts.append(file_contents[position:token_start])
+        position = token_match.end()
+        if token == delimiter:
+            statement = get_normalised_statement(statement_parts)
+            if len(statement) > 0:
+                yield statement
+            statement_parts = []
+        elif token == "--":
+            line_end = file_contents.find("\n", position)
+            position = len(file_contents) if line_end == -1 else line_end
+            statement_parts.append(" ")
+        elif token == "/*":
+            position = get_block_comment_end(file_contents, token_start)
+            statement_parts.append(" ")
+        elif token == "$":
+            dollar_quote_match = dollar_quote_regex.match(
+                file_contents, token_start
+            )
+            if dollar_quote_match is None or (
+                token_start > 0
+                and is_identifier_character(file_contents[token_start - 1])
+            ):
+                statement_parts.append(token)
+                continue
+            dollar_quote = dollar_quote_match.group()
+            quote_end = file_contents.find(
+                dollar_quote, dollar_quote_match.end()
+            )
+            position = (
+                len(file_contents)
+                if quote_end == -1
+                else quote_end + len(dollar_quote)
+            )
+            statement_parts.append(file_contents[token_start:position])
+        else:
+            position = get_quoted_end(
+                file_contents,
+                token_start,
+                token,
+                token == "'"
+                and is_escape_string_start(file_contents, token_start),
+            )
+            statement_parts.append(file_contents[token_start:position])
+    statement = get_normalised_statement(statement_parts)
+    if len(statement) > 0:
+        yield statement
 
 
 def get_statements_from_postgres_file_contents(
     file_contents: str, delimiter: str = ";"
 ) -> list[str]:
-    normalised_file_contents = normalise_postgres_file_contents(file_contents)
-    statements = normalised_file_contents.split(delimiter)
-    return [statement.strip() for statement in statements if len(statement) > 0]
+    return list(
+        iterate_statements_from_postgres_file_contents(file_contents, delimiter)
+    )
 
 
 def get_statements_from_postgres_file(
@@ -77,34 +195,13 @@ def get_statements_from_postgres_file(
     return get_statements_from_postgres_file_contents(file_contents, delimiter)
 
 
-def get_postgres_module_for_postgres_file[T: PythonablePostgresObject](
+def get_postgres_objects_for_postgres_statements[T: PythonablePostgresObject](
     get_postgres_object_for_statement: Callable[[str], Optional[T]],
-    get_python_code_for_postgres_objects: Callable[
-        [PythonPostgresModuleLookup, list[T]], str
-    ],
-    postgres_scripts_path: Path,
-    python_output_module: str,
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
-    file_path: Path,
-) -> tuple[PythonPostgresModuleLookup, PythonPostgresModule[T]]:
-    postgres_statements = get_statements_from_postgres_file(file_path)
-    postgres_objects = [
+    postgres_statements: list[str],
+) -> list[T]:
+    return [
         postgres_object
         for statement in postgres_statements
-        if (postgres_object := get_postgres_object_for_statement(statement)) is not None
+        if (postgres_object := get_postgres_object_for_statement(statement))
+        is not None
     ]
-    python_module_name = get_python_module_name_for_postgres_file(
-        postgres_scripts_path,
-        file_path,
-        python_output_module,
-    )
-    python_code = get_python_code_for_postgres_objects(
-        python_postgres_module_lookup, postgres_objects
-    )
-    for postgres_object in postgres_objects:
-        python_name = postgres_object.get_python_name()
-        python_postgres_module_lookup[python_name] = python_module_name
-    python_postgres_module = PythonPostgresModule(
-        python_module_name, postgres_objects, python_code
-    )
-    return (python_postgres_module_lookup, python_postgres_module)
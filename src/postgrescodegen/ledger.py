@@ -0,0 +1,38 @@
+import psycopg
+
+ledger_table_name = "postgrescodegen_roll_ledger"
+
+
+class RollLedger:
+    def __init__(self, conn: psycopg.Connection):
+        self.conn = conn
+        self.conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {ledger_table_name} (
+                script_name TEXT PRIMARY KEY,
+                script_hash TEXT NOT NULL,
+                rolled_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+            )
+            """
+        )
+        rows = self.conn.execute(
+            f"SELECT script_name, script_hash FROM {ledger_table_name}"
+        ).fetchall()
+        self.rolled_script_hashes: dict[str, str] = {
+            script_name: script_hash for script_name, script_hash in rows
+        }
+
+    def is_script_rolled(self, script_name: str, script_hash: str) -> bool:
+        return self.rolled_script_hashes.get(script_name) == script_hash
+
+    def record_script_rolled(self, script_name: str, script_hash: str):
+        self.conn.execute(
+            f"""
+            INSERT INTO {ledger_table_name} (script_name, script_hash, rolled_at)
+            VALUES (%s, %s, now())
+            ON CONFLICT (script_name) DO UPDATE
+            SET script_hash = EXCLUDED.script_hash, rolled_at = EXCLUDED.rolled_at
+            """,
+            [script_name, script_hash],
+        )
+        self.rolled_script_hashes[script_name] = script_hash
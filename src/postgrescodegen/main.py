@@ -1,8 +1,11 @@
 import argparse
 from pathlib import Path
 
-from postgrescodegen.classes import DbCredentials, InputArgs
+from postgrescodegen.classes import CodegenOptions, DbCredentials, InputArgs
+from postgrescodegen.funcgen import row_factories, transaction_modes
 from postgrescodegen.processor import process_all_script_files
+from postgrescodegen.profiling import StageTimer, report_profile
+from postgrescodegen.runner import roll_modes
 from postgrescodegen.watcher import start_watcher
 
 
@@ -40,6 +43,12 @@ def parse_arguments() -> InputArgs:
         const=True,
         help="Watch for changes in the user scripts directory and regenerate code automatically.",
     )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="Seconds to wait after the last change in watch mode before regenerating code",
+    )
     parser.add_argument(
         "-r",
         "--roll",
@@ -49,6 +58,21 @@ def parse_arguments() -> InputArgs:
         const=True,
         help="Roll any scripts into the database before generating code",
     )
+    parser.add_argument(
+        "--roll-mode",
+        type=str,
+        choices=roll_modes,
+        default="connection",
+        help="Roll scripts over a single db connection, in a single transaction, or with a psql process per script",
+    )
+    parser.add_argument(
+        "--force-roll",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Roll all scripts into the db, even if they are unchanged since they were last rolled",
+    )
     parser.add_argument(
         "--dbhost",
         nargs="?",
@@ -81,6 +105,129 @@ def parse_arguments() -> InputArgs:
         default=None,
         help="Path to a file containing a password for the db the scripts should be rolled into",
     )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Path to the manifest used to only regenerate changed files (default: <output>/.postgrescodegen-manifest.json)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Ignore any existing manifest and regenerate all files",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes to use to parse and generate code",
+    )
+    parser.add_argument(
+        "--async",
+        dest="generate_async",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Also generate async variants of each function and of register_types",
+    )
+    parser.add_argument(
+        "--prepare",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Pass prepare=True when executing every function and generate functions/check.py",
+    )
+    parser.add_argument(
+        "--prepare-function",
+        dest="prepare_functions",
+        action="append",
+        default=[],
+        help="Pass prepare=True when executing this db function. Can be given multiple times",
+    )
+    parser.add_argument(
+        "--binary",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Fetch function results using the binary protocol and register binary loaders and dumpers for the types",
+    )
+    parser.add_argument(
+        "--slots",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Generate the dataclasses for the types with slots=True",
+    )
+    parser.add_argument(
+        "--frozen",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Generate the dataclasses for the types with frozen=True",
+    )
+    parser.add_argument(
+        "--row-factory",
+        type=str,
+        choices=row_factories,
+        default="class",
+        help="How functions build their rows: class for the generated dataclasses, tuple for plain tuples, namedtuple for generated NamedTuples, or columns to also generate a _fetch_columns variant returning a dict of lists",
+    )
+    parser.add_argument(
+        "--row-factory-function",
+        dest="row_factory_functions",
+        type=parse_row_factory_function_string,
+        action="append",
+        default=[],
+        help="Override the row factory for one db function, as FUNCTION=ROW_FACTORY. Can be given multiple times",
+    )
+    parser.add_argument(
+        "--arrays",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Also generate a _fetch_arrays variant returning NumPy arrays for each function returning a composite type",
+    )
+    parser.add_argument(
+        "--copy",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Also generate a _copy variant that uploads arrays of composite arguments with COPY for each function taking one",
+    )
+    parser.add_argument(
+        "--lazy-imports",
+        nargs="?",
+        type=parse_bool_string,
+        default=False,
+        const=True,
+        help="Generate package __init__ files exposing types and functions lazily, and only import the types in register.py when registering them",
+    )
+    parser.add_argument(
+        "--transaction-mode",
+        type=str,
+        choices=transaction_modes,
+        default="function",
+        help="function to commit or roll back inside every generated function, caller to leave the transaction to the caller",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        default=None,
+        const=Path("postgrescodegen-profile.json"),
+        help="Print the time spent in each stage and write a Chrome trace to this path (default: postgrescodegen-profile.json)",
+    )
     args = parser.parse_args()
     if (
         args.roll
@@ -95,6 +242,13 @@ def parse_arguments() -> InputArgs:
         )
     else:
         db_credentials = None
+    manifest_path = (
+        args.manifest
+        if args.manifest is not None
+        else args.output / ".postgrescodegen-manifest.json"
+    )
+    if args.rebuild:
+        manifest_path.unlink(missing_ok=True)
     return InputArgs(
         user_scripts_path=args.input,
         python_source_root=args.output,
@@ -102,12 +256,35 @@ def parse_arguments() -> InputArgs:
         resources_path=args.resources,
         watch_files=args.watch,
         roll_scripts=args.roll,
+        roll_mode=args.roll_mode,
+        force_roll=args.force_roll,
         db_credentials=db_credentials,
+        manifest_path=manifest_path,
+        jobs=max(1, args.jobs),
+        watch_debounce_seconds=max(0.0, args.debounce),
+        profile_path=args.profile,
+        codegen_options=CodegenOptions(
+            generate_async=args.generate_async,
+            prepare=args.prepare,
+            prepare_functions=tuple(sorted(set(args.prepare_functions))),
+            transaction_mode=args.transaction_mode,
+            binary=args.binary,
+            slots=args.slots,
+            frozen=args.frozen,
+            row_factory=args.row_factory,
+            row_factory_functions=tuple(
+                sorted(dict(args.row_factory_functions).items())
+            ),
+            arrays=args.arrays,
+            copy=args.copy,
+            lazy_imports=args.lazy_imports,
+        ),
     )
 
 
 def main():
     args = parse_arguments()
+    stage_timer = StageTimer() if args.profile_path is not None else None
     process_all_script_files(
         args.resources_path,
         args.user_scripts_path,
@@ -115,7 +292,15 @@ def main():
         args.output_code_module,
         args.roll_scripts,
         args.db_credentials,
+        args.manifest_path,
+        args.jobs,
+        args.roll_mode,
+        args.force_roll,
+        stage_timer,
+        args.codegen_options,
     )
+    if stage_timer is not None and args.profile_path is not None:
+        report_profile(stage_timer, args.profile_path)
     if args.watch_files:
         start_watcher(
             args.resources_path,
@@ -124,6 +309,12 @@ def main():
             args.output_code_module,
             args.roll_scripts,
             args.db_credentials,
+            args.manifest_path,
+            args.jobs,
+            args.roll_mode,
+            args.watch_debounce_seconds,
+            args.profile_path,
+            args.codegen_options,
         )
 
 
@@ -131,5 +322,14 @@ def parse_bool_string(value: str) -> bool:
     return value != "0"
 
 
+def parse_row_factory_function_string(value: str) -> tuple[str, str]:
+    function_name, _, row_factory = value.partition("=")
+    if function_name == "" or row_factory not in row_factories:
+        raise argparse.ArgumentTypeError(
+            f"expected FUNCTION=ROW_FACTORY with ROW_FACTORY one of {', '.join(row_factories)}"
+        )
+    return (function_name, row_factory)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,232 @@
+import hashlib
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+from postgrescodegen.classes import (
+    CodegenOptions,
+    PostgresDomain,
+    PostgresFunction,
+    PostgresFunctionArgument,
+    PostgresType,
+    PostgresTypeField,
+    PythonPostgresModuleLookup,
+    ScriptManifest,
+    ScriptManifestEntry,
+)
+from postgrescodegen.dependencies import are_dependencies_resolved_identically
+from postgrescodegen.files import write_file_if_changed
+
+manifest_version = "11"
+
+
+def get_manifest_settings(
+    output_code_module: str, codegen_options: CodegenOptions
+) -> dict[str, str]:
+    settings = {
+        "manifest_version": manifest_version,
+        "output_code_module": output_code_module,
+    }
+    for option_name, option_value in asdict(codegen_options).items():
+        settings[f"codegen_{option_name}"] = str(option_value)
+    return settings
+
+
+def get_file_hash(file_path: Path) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_manifest_key_for_script_file(
+    user_scripts_path: Path, script_file: Path
+) -> str:
+    return script_file.relative_to(user_scripts_path).as_posix()
+
+
+def get_postgres_type_from_json(type_json: dict[str, Any]) -> PostgresType:
+    return PostgresType(
+        type_json["type_name"],
+        [
+            PostgresTypeField(
+                field_json["field_name"], field_json["field_type"]
+            )
+            for field_json in type_json["type_fields"]
+        ],
+    )
+
+
+def get_json_for_postgres_type(postgres_type: PostgresType) -> dict[str, Any]:
+    return {
+        "type_name": postgres_type.type_name,
+        "type_fields": [
+            {"field_name": field.field_name, "field_type": field.field_type}
+            for field in postgres_type.type_fields
+        ],
+    }
+
+
+def get_postgres_function_from_json(
+    function_json: dict[str, Any],
+) -> PostgresFunction:
+    return PostgresFunction(
+        function_json["function_name"],
+        function_json["function_return"],
+        [
+            PostgresFunctionArgument(
+                argument_json["argument_name"], argument_json["argument_type"]
+            )
+            for argument_json in function_json["function_args"]
+        ],
+    )
+
+
+def get_json_for_postgres_function(
+    postgres_function: PostgresFunction,
+) -> dict[str, Any]:
+    return {
+        "function_name": postgres_function.function_name,
+        "function_return": postgres_function.function_return,
+        "function_args": [
+            {
+                "argument_name": argument.argument_name,
+                "argument_type": argument.argument_type,
+            }
+            for argument in postgres_function.function_args
+        ],
+    }
+
+
+def get_manifest_entry_from_json(
+    entry_json: dict[str, Any],
+) -> ScriptManifestEntry:
+    generated_file = entry_json["generated_file"]
+    return ScriptManifestEntry(
+        entry_json["file_hash"],
+        Path(generated_file) if generated_file is not None else None,
+        [
+            (python_name, module_name)
+            for python_name, module_name in entry_json["lookup_entries"]
+        ],
+        entry_json["dependencies"],
+        [
+            get_postgres_type_from_json(type_json)
+            for type_json in entry_json["postgres_types"]
+        ],
+        [
+            PostgresDomain(
+                domain_json["domain_name"], domain_json["underlying_type"]
+            )
+            for domain_json in entry_json["postgres_domains"]
+        ],
+        [
+            get_postgres_function_from_json(function_json)
+            for function_json in entry_json["postgres_functions"]
+        ],
+    )
+
+
+def get_json_for_manifest_entry(entry: ScriptManifestEntry) -> dict[str, Any]:
+    return {
+        "file_hash": entry.file_hash,
+        "generated_file": (
+            str(entry.generated_file)
+            if entry.generated_file is not None
+            else None
+        ),
+        "lookup_entries": [
+            list(lookup_entry) for lookup_entry in entry.lookup_entries
+        ],
+        "dependencies": entry.dependencies,
+        "postgres_types": [
+            get_json_for_postgres_type(postgres_type)
+            for postgres_type in entry.postgres_types
+        ],
+        "postgres_domains": [
+            {
+                "domain_name": postgres_domain.domain_name,
+                "underlying_type": postgres_domain.underlying_type,
+            }
+            for postgres_domain in entry.postgres_domains
+        ],
+        "postgres_functions": [
+            get_json_for_postgres_function(postgres_function)
+            for postgres_function in entry.postgres_functions
+        ],
+    }
+
+
+def get_empty_manifest(settings: dict[str, str]) -> ScriptManifest:
+    return ScriptManifest(settings, {})
+
+
+def load_manifest(
+    manifest_path: Path, settings: dict[str, str]
+) -> ScriptManifest:
+    if not manifest_path.is_file():
+        return get_empty_manifest(settings)
+    try:
+        with open(manifest_path, "r") as f:
+            manifest_json = json.load(f)
+        if manifest_json["settings"] != settings:
+            print("Manifest settings have changed, regenerating all files")
+            return get_empty_manifest(settings)
+        entries = {
+            key: get_manifest_entry_from_json(entry_json)
+            for key, entry_json in manifest_json["entries"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(
+            f"Could not read manifest {manifest_path}, regenerating all files: {e}"
+        )
+        return get_empty_manifest(settings)
+    return ScriptManifest(settings, entries)
+
+
+def save_manifest(manifest_path: Path, manifest: ScriptManifest):
+    manifest_json = {
+        "settings": manifest.settings,
+        "entries": {
+            key: get_json_for_manifest_entry(entry)
+            for key, entry in sorted(manifest.entries.items())
+        },
+    }
+    write_file_if_changed(
+        manifest_path, json.dumps(manifest_json, indent=2).encode("utf-8")
+    )
+
+
+def is_manifest_entry_up_to_date(
+    manifest: ScriptManifest, manifest_key: str, file_hash: str
+) -> bool:
+    entry = manifest.entries.get(manifest_key)
+    return (
+        entry is not None
+        and entry.file_hash == file_hash
+        and (entry.generated_file is None or entry.generated_file.is_file())
+    )
+
+
+def get_reusable_manifest_entry(
+    manifest: ScriptManifest,
+    manifest_key: str,
+    file_hash: str,
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+) -> Optional[ScriptManifestEntry]:
+    if not is_manifest_entry_up_to_date(manifest, manifest_key, file_hash):
+        return None
+    entry = manifest.entries[manifest_key]
+    if not are_dependencies_resolved_identically(
+        python_postgres_module_lookup, entry.dependencies
+    ):
+        return None
+    return entry
+
+
+def apply_manifest_entry_to_lookup(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    entry: ScriptManifestEntry,
+) -> PythonPostgresModuleLookup:
+    for python_name, module_name in entry.lookup_entries:
+        python_postgres_module_lookup[python_name] = module_name
+    return python_postgres_module_lookup
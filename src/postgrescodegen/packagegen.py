@@ -0,0 +1,212 @@
+import os
+import re
+
+from pathlib import Path
+
+from postgrescodegen.classes import PythonImportDict
+from postgrescodegen.files import get_path_for_module, write_file_if_changed
+from postgrescodegen.generator import (
+    get_import_statement_for_module,
+    get_import_statements_for_python_import_dict,
+    update_python_type_import_dict,
+)
+
+tab = "    "
+python_definition_regex = re.compile(
+    r"^(?:async def|def|class) ([A-Za-z][A-Za-z0-9_]*)", re.MULTILINE
+)
+
+
+def get_python_definition_names_for_python_file(
+    python_file_path: Path,
+) -> list[str]:
+    with open(python_file_path, "r") as f:
+        file_contents = f.read()
+    return python_definition_regex.findall(file_contents)
+
+
+def get_package_module_name(
+    python_output_module: str,
+    python_output_module_path: Path,
+    package_path: Path,
+) -> str:
+    relative_package_path = package_path.relative_to(python_output_module_path)
+    return ".".join([python_output_module, *relative_package_path.parts])
+
+
+def is_package_submodule_name(module_name: str) -> bool:
+    return module_name.isidentifier() and not module_name.startswith("_")
+
+
+def is_package_submodule_file(file_name: str) -> bool:
+    module_name, extension = os.path.splitext(file_name)
+    return extension == ".py" and is_package_submodule_name(module_name)
+
+
+def get_indented_lines(indent: int, code: str) -> list[str]:
+    return [f"{tab * indent}{line}" for line in code.split("\n")]
+
+
+def get_package_type_checking_imports(
+    package_module_name: str,
+    submodule_names: list[str],
+    attribute_modules: dict[str, str],
+) -> list[str]:
+    import_dict: PythonImportDict = {}
+    for attribute_name, module_name in attribute_modules.items():
+        import_dict = update_python_type_import_dict(
+            import_dict, module_name, attribute_name
+        )
+    import_lines = ["if TYPE_CHECKING:"]
+    if len(submodule_names) > 0:
+        import_lines.extend(
+            get_indented_lines(
+                1,
+                get_import_statement_for_module(
+                    package_module_name, set(submodule_names)
+                ),
+            )
+        )
+    if len(import_dict) > 0:
+        import_lines.extend(
+            get_indented_lines(
+                1, get_import_statements_for_python_import_dict(import_dict)
+            )
+        )
+    if len(import_lines) == 1:
+        import_lines.append(f"{tab}pass")
+    return import_lines
+
+
+def get_package_init_code(
+    package_module_name: str,
+    submodule_names: list[str],
+    attribute_modules: dict[str, str],
+) -> str:
+    exported_names = sorted(set(submodule_names) | set(attribute_modules))
+    imports = "\n".join(
+        [
+            "from importlib import import_module",
+            "from typing import TYPE_CHECKING, Any",
+            "",
+            *get_package_type_checking_imports(
+                package_module_name, submodule_names, attribute_modules
+            ),
+        ]
+    )
+    lazy_submodules = "\n".join(
+        [
+            "lazy_submodules: list[str] = [",
+            *[
+                f'{tab}"{submodule_name}",'
+                for submodule_name in submodule_names
+            ],
+            "]",
+        ]
+    )
+    lazy_attributes = "\n".join(
+        [
+            "lazy_attributes: dict[str, str] = {",
+            *[
+                f'{tab}"{attribute_name}": "{module_name}",'
+                for attribute_name, module_name in attribute_modules.items()
+            ],
+            "}",
+        ]
+    )
+    exports = "\n".join(
+        [
+            "__all__ = [",
+            *[f'{tab}"{exported_name}",' for exported_name in exported_names],
+            "]",
+        ]
+    )
+    getattr_function = "\n".join(
+        [
+            "def __getattr__(name: str) -> Any:",
+            f"{tab}if name in lazy_submodules:",
+            f'{tab * 2}return import_module(f"{{__name__}}.{{name}}")',
+            f"{tab}module_name = lazy_attributes.get(name)",
+            f"{tab}if module_name is None:",
+            f'{tab * 2}raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")',
+            f"{tab}value = getattr(import_module(module_name), name)",
+            f"{tab}globals()[name] = value",
+            f"{tab}return value",
+        ]
+    )
+    dir_function = "\n".join(
+        [
+            "def __dir__() -> list[str]:",
+            f"{tab}return __all__",
+        ]
+    )
+    return "\n\n\n".join(
+        [
+            imports,
+            f"{lazy_submodules}\n\n{lazy_attributes}\n\n{exports}",
+            getattr_function,
+            dir_function,
+        ]
+    )
+
+
+def get_package_init_code_for_directory(
+    python_output_module: str,
+    python_output_module_path: Path,
+    package_path: Path,
+    directory_names: list[str],
+    file_names: list[str],
+) -> str:
+    package_module_name = get_package_module_name(
+        python_output_module, python_output_module_path, package_path
+    )
+    submodule_file_names = sorted(
+        file_name
+        for file_name in file_names
+        if is_package_submodule_file(file_name)
+    )
+    submodule_names = sorted(
+        [
+            directory_name
+            for directory_name in directory_names
+            if is_package_submodule_name(directory_name)
+        ]
+        + [os.path.splitext(file_name)[0] for file_name in submodule_file_names]
+    )
+    attribute_modules: dict[str, str] = {}
+    for file_name in submodule_file_names:
+        module_name = f"{package_module_name}.{os.path.splitext(file_name)[0]}"
+        for definition_name in get_python_definition_names_for_python_file(
+            package_path / file_name
+        ):
+            if definition_name not in submodule_names:
+                attribute_modules.setdefault(definition_name, module_name)
+    return get_package_init_code(
+        package_module_name, submodule_names, attribute_modules
+    )
+
+
+def create_package_init_files_in_directory(
+    python_package_path: Path, python_output_module: str
+) -> list[Path]:
+    python_output_module_path = get_path_for_module(
+        python_package_path, python_output_module, False
+    )
+    generated_files: list[Path] = []
+    for root, directory_names, file_names in os.walk(python_output_module_path):
+        directory_names[:] = [
+            directory_name
+            for directory_name in directory_names
+            if is_package_submodule_name(directory_name)
+        ]
+        package_init_code = get_package_init_code_for_directory(
+            python_output_module,
+            python_output_module_path,
+            Path(root),
+            directory_names,
+            file_names,
+        )
+        init_file = Path(root) / "__init__.py"
+        write_file_if_changed(init_file, package_init_code.encode("utf-8"))
+        generated_files.append(init_file)
+    return generated_files
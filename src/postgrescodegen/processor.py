@@ -1,151 +1,218 @@
 import os
-import shutil
 
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 from typing import Callable, Optional
 
+from postgrescodegen.check import (
+    get_check_module_code,
+    is_check_module_generated,
+)
 from postgrescodegen.classes import (
+    CodegenOptions,
     DbCredentials,
+    ParsedScriptFile,
     PostgresDomain,
     PostgresFunction,
-    PostgresObject,
     PostgresType,
-    PythonPostgresModule,
     PythonPostgresModuleLookup,
+    ScriptEmitTask,
+    ScriptManifest,
+    ScriptManifestEntry,
 )
-from postgrescodegen.domaingen import (
-    get_postgres_domain_for_statement,
-    get_python_code_for_postgres_domain,
+from postgrescodegen.dependencies import (
+    get_affected_script_keys,
+    get_lookup_for_resolved_dependencies,
+    get_referenced_python_names_for_postgres_domains,
+    get_referenced_python_names_for_postgres_functions,
+    get_referenced_python_names_for_postgres_types,
+    get_resolved_dependencies,
+    get_script_dependents_graph,
 )
+from postgrescodegen.domaingen import get_postgres_domain_for_statement
 from postgrescodegen.files import (
     clean_output_directory,
     create_py_typed_files_in_directory,
     get_db_script_files,
     get_postgres_files_in_directory,
+    get_python_file_path_for_module,
+    get_python_module_name_for_postgres_file,
+    write_file_if_changed,
     write_python_file,
 )
 from postgrescodegen.funcgen import (
-    get_python_postgres_module_for_postgres_function_file,
+    get_postgres_function_from_statement,
+    get_python_code_for_postgres_functions,
+)
+from postgrescodegen.generator import (
+    get_postgres_objects_for_postgres_statements,
+    get_statements_from_postgres_file,
+)
+from postgrescodegen.manifest import (
+    apply_manifest_entry_to_lookup,
+    get_empty_manifest,
+    get_file_hash,
+    get_manifest_key_for_script_file,
+    get_manifest_settings,
+    get_reusable_manifest_entry,
+    is_manifest_entry_up_to_date,
+    load_manifest,
+    save_manifest,
+)
+from postgrescodegen.packagegen import create_package_init_files_in_directory
+from postgrescodegen.profiling import (
+    StageTimer,
+    call_with_stage_timer,
+    time_stage,
 )
-from postgrescodegen.generator import get_postgres_module_for_postgres_file
 from postgrescodegen.register import get_register_module_code
-from postgrescodegen.runner import run_in_script_file
+from postgrescodegen.runner import ScriptRunner, get_script_runner
 from postgrescodegen.typegen import (
-    get_python_postgres_module_for_postgres_type_file,
+    get_postgres_type_for_statement,
+    get_python_code_for_postgres_types,
 )
 
 
-def process_script_file[T: PostgresObject](
-    postgres_scripts_path: Path,
-    python_output_module: str,
-    python_package_path: Path,
-    roll_scripts: bool,
-    db_credentials: Optional[DbCredentials],
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
-    get_script_file_module: Callable[
-        [Path, str, PythonPostgresModuleLookup, Path],
-        tuple[PythonPostgresModuleLookup, PythonPostgresModule[T]],
-    ],
+def parse_type_script_file(
+    user_scripts_path: Path,
+    output_code_module: str,
     script_file: Path,
-) -> Optional[
-    tuple[PythonPostgresModuleLookup, PythonPostgresModule[T], Optional[Path]]
-]:
+    stage_timer: Optional[StageTimer] = None,
+) -> Optional[ParsedScriptFile]:
+    print(f"Processing type file {script_file}")
     try:
-        if roll_scripts and db_credentials is not None:
-            run_in_script_file(db_credentials, script_file)
-        python_postgres_module_lookup, script_file_module = get_script_file_module(
-            postgres_scripts_path,
-            python_output_module,
-            python_postgres_module_lookup,
-            script_file,
-        )
-        if len(script_file_module.module_objects) > 0:
-            generated_file_path = write_python_file(
-                python_package_path,
-                script_file_module.module_name,
-                script_file_module.python_code,
+        with time_stage(stage_timer, "parse", script_file):
+            postgres_statements = get_statements_from_postgres_file(script_file)
+            return ParsedScriptFile(
+                script_file,
+                get_python_module_name_for_postgres_file(
+                    user_scripts_path, script_file, output_code_module
+                ),
+                get_postgres_objects_for_postgres_statements(
+                    get_postgres_type_for_statement, postgres_statements
+                ),
+                get_postgres_objects_for_postgres_statements(
+                    get_postgres_domain_for_statement, postgres_statements
+                ),
+                [],
             )
-        else:
-            generated_file_path = None
-        return python_postgres_module_lookup, script_file_module, generated_file_path
     except Exception as e:
         print(f"Error processing script file {script_file}: {e}")
         return None
 
 
-def process_type_script_file(
-    postgres_input_root_path: Path,
-    python_output_root_module: str,
-    python_output_root_path: Path,
-    roll_scripts: bool,
-    db_credentials: Optional[DbCredentials],
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
-    script_file: Path,
-) -> Optional[
-    tuple[
-        PythonPostgresModuleLookup, PythonPostgresModule[PostgresType], Optional[Path]
-    ]
-]:
-    print(f"Processing type file {script_file}")
-    return process_script_file(
-        postgres_input_root_path,
-        python_output_root_module,
-        python_output_root_path,
-        roll_scripts,
-        db_credentials,
-        python_postgres_module_lookup,
-        get_python_postgres_module_for_postgres_type_file,
-        script_file,
-    )
-
-
 def process_view_script_file(
-    roll_scripts: bool,
-    db_credentials: Optional[DbCredentials],
+    script_runner: Optional[ScriptRunner],
+    script_name: str,
     script_file: Path,
+    stage_timer: Optional[StageTimer] = None,
 ):
     print(f"Processing view file {script_file}")
-    if roll_scripts and db_credentials is not None:
-        run_in_script_file(db_credentials, script_file)
+    roll_script_file(script_runner, script_name, script_file, stage_timer)
 
 
-def process_function_script_file(
-    postgres_input_root_path: Path,
-    python_output_root_module: str,
-    python_output_root_path: Path,
-    roll_scripts: bool,
-    db_credentials: Optional[DbCredentials],
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
+def parse_function_script_file(
+    user_scripts_path: Path,
+    output_code_module: str,
     script_file: Path,
-) -> Optional[
-    tuple[
-        PythonPostgresModuleLookup,
-        PythonPostgresModule[PostgresFunction],
-        Optional[Path],
-    ]
-]:
+    stage_timer: Optional[StageTimer] = None,
+) -> Optional[ParsedScriptFile]:
     print(f"Processing function file {script_file}")
-    return process_script_file(
-        postgres_input_root_path,
-        python_output_root_module,
-        python_output_root_path,
-        roll_scripts,
-        db_credentials,
-        python_postgres_module_lookup,
-        get_python_postgres_module_for_postgres_function_file,
-        script_file,
+    try:
+        with time_stage(stage_timer, "parse", script_file):
+            postgres_statements = get_statements_from_postgres_file(script_file)
+            return ParsedScriptFile(
+                script_file,
+                get_python_module_name_for_postgres_file(
+                    user_scripts_path, script_file, output_code_module
+                ),
+                [],
+                [],
+                get_postgres_objects_for_postgres_statements(
+                    get_postgres_function_from_statement, postgres_statements
+                ),
+            )
+    except Exception as e:
+        print(f"Error processing script file {script_file}: {e}")
+        return None
+
+
+def emit_script_file(
+    python_source_root: Path,
+    codegen_options: CodegenOptions,
+    emit_task: ScriptEmitTask,
+    stage_timer: Optional[StageTimer] = None,
+) -> Optional[tuple[Path, bool]]:
+    try:
+        with time_stage(stage_timer, "emit", emit_task.script_file):
+            if len(emit_task.postgres_types) > 0:
+                python_code = get_python_code_for_postgres_types(
+                    emit_task.python_postgres_module_lookup,
+                    emit_task.postgres_types,
+                    codegen_options,
+                )
+            else:
+                python_code = get_python_code_for_postgres_functions(
+                    emit_task.python_postgres_module_lookup,
+                    emit_task.postgres_functions,
+                    codegen_options,
+                )
+        with time_stage(stage_timer, "write", emit_task.script_file):
+            return write_python_file(
+                python_source_root, emit_task.module_name, python_code
+            )
+    except Exception as e:
+        print(f"Error processing script file {emit_task.script_file}: {e}")
+        return None
+
+
+def map_script_files[T, U](
+    executor: Optional[Executor],
+    jobs: int,
+    function: Callable[[T, Optional[StageTimer]], U],
+    items: list[T],
+    stage_timer: Optional[StageTimer] = None,
+) -> list[U]:
+    if executor is None or len(items) < 2:
+        return [function(item, stage_timer) for item in items]
+    chunksize = max(1, len(items) // (jobs * 4))
+    if stage_timer is None:
+        return list(
+            executor.map(function, items, repeat(None), chunksize=chunksize)
+        )
+    timed_results = list(
+        executor.map(
+            partial(call_with_stage_timer, function), items, chunksize=chunksize
+        )
     )
+    for _, stage_timings in timed_results:
+        stage_timer.stage_timings.extend(stage_timings)
+    return [result for result, _ in timed_results]
 
 
 def process_internal_script_files(
     resources_path: Path,
-    roll_scripts: bool,
-    db_credentials: Optional[DbCredentials],
-):
-    internal_files = get_db_script_files(resources_path / "sql")
+    script_runner: Optional[ScriptRunner],
+    force_roll: bool = False,
+    stage_timer: Optional[StageTimer] = None,
+) -> bool:
+    if script_runner is None:
+        return False
+    internal_scripts_path = resources_path / "sql"
+    internal_files = get_db_script_files(internal_scripts_path)
+    rolled_internal_file = False
     for file in internal_files:
-        if roll_scripts and db_credentials is not None:
-            run_in_script_file(db_credentials, file)
+        script_name = f"internal/{get_manifest_key_for_script_file(internal_scripts_path, file)}"
+        if force_roll or not is_script_file_rolled(
+            script_runner, script_name, file
+        ):
+            roll_script_file(script_runner, script_name, file, stage_timer)
+            rolled_internal_file = True
+        else:
+            print(f"Skipping {file} as it is already rolled into the db")
+    return rolled_internal_file
 
 
 def copy_python_resources(
@@ -161,8 +228,8 @@ def copy_python_resources(
                 / output_code_module.split(".", maxsplit=1)[1].replace(".", "/")
                 / relative_path
             )
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copyfile(full_path, dest_path)
+            with open(full_path, "rb") as f:
+                write_file_if_changed(dest_path, f.read())
 
 
 def process_register_types_file(
@@ -171,80 +238,573 @@ def process_register_types_file(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_types: list[PostgresType],
     postgres_domains: list[PostgresDomain],
-) -> Path:
+    codegen_options: CodegenOptions,
+) -> tuple[Path, bool]:
     register_type_module = get_register_module_code(
-        python_postgres_module_lookup, postgres_types, postgres_domains
+        python_postgres_module_lookup,
+        postgres_types,
+        postgres_domains,
+        codegen_options,
     )
     return write_python_file(
         output_root_path, f"{output_module_name}.types.register", register_type_module
     )
 
 
+def process_check_functions_file(
+    output_root_path: Path,
+    output_module_name: str,
+    postgres_functions: list[PostgresFunction],
+    codegen_options: CodegenOptions,
+) -> tuple[Path, bool]:
+    check_module = get_check_module_code(postgres_functions, codegen_options)
+    return write_python_file(
+        output_root_path, f"{output_module_name}.functions.check", check_module
+    )
+
+
+def is_script_file_rolled(
+    script_runner: ScriptRunner, script_name: str, script_file: Path
+) -> bool:
+    return (
+        script_runner.ledger is not None
+        and script_runner.ledger.is_script_rolled(
+            script_name, get_file_hash(script_file)
+        )
+    )
+
+
+def roll_script_file(
+    script_runner: Optional[ScriptRunner],
+    script_name: str,
+    script_file: Path,
+    stage_timer: Optional[StageTimer] = None,
+):
+    if script_runner is None:
+        return
+    with time_stage(stage_timer, "roll", script_file):
+        file_hash = get_file_hash(script_file)
+        if (
+            script_runner.run_in_script_file(script_file)
+            and script_runner.ledger is not None
+        ):
+            script_runner.ledger.record_script_rolled(script_name, file_hash)
+
+
+def is_script_file_affected(
+    user_scripts_path: Path,
+    affected_script_keys: Optional[set[str]],
+    script_file: Path,
+) -> bool:
+    return (
+        affected_script_keys is None
+        or get_manifest_key_for_script_file(user_scripts_path, script_file)
+        in affected_script_keys
+    )
+
+
+def get_affected_script_keys_for_changed_script_files(
+    user_scripts_path: Path,
+    type_files: list[Path],
+    view_files: list[Path],
+    previous_manifest: ScriptManifest,
+    changed_script_keys: set[str],
+) -> Optional[set[str]]:
+    if len(changed_script_keys) == 0:
+        return changed_script_keys
+    if len(previous_manifest.entries) == 0:
+        print(
+            "Rolling all scripts as there is no manifest to find their dependents"
+        )
+        return None
+    affected_script_keys = get_affected_script_keys(
+        get_script_dependents_graph(previous_manifest), changed_script_keys
+    )
+    type_script_keys = {
+        get_manifest_key_for_script_file(user_scripts_path, file)
+        for file in type_files
+    }
+    if len(affected_script_keys & type_script_keys) > 0:
+        affected_script_keys |= {
+            get_manifest_key_for_script_file(user_scripts_path, file)
+            for file in view_files
+        }
+    return affected_script_keys
+
+
+def roll_user_script_files(
+    user_scripts_path: Path,
+    type_files: list[Path],
+    view_files: list[Path],
+    function_files: list[Path],
+    script_runner: Optional[ScriptRunner],
+    affected_script_keys: Optional[set[str]],
+    previous_manifest: ScriptManifest,
+    force_roll: bool,
+    stage_timer: Optional[StageTimer] = None,
+):
+    if script_runner is None:
+        return
+    if affected_script_keys is None and not force_roll:
+        script_files = type_files + view_files + function_files
+        changed_script_keys: set[str] = set()
+        for file in script_files:
+            script_name = get_manifest_key_for_script_file(
+                user_scripts_path, file
+            )
+            if not is_script_file_rolled(script_runner, script_name, file):
+                changed_script_keys.add(script_name)
+        affected_script_keys = (
+            get_affected_script_keys_for_changed_script_files(
+                user_scripts_path,
+                type_files,
+                view_files,
+                previous_manifest,
+                changed_script_keys,
+            )
+        )
+        if affected_script_keys is not None:
+            skipped_script_count = len(script_files) - len(affected_script_keys)
+            if skipped_script_count > 0:
+                print(
+                    f"Skipping {skipped_script_count} scripts already rolled into the db"
+                )
+    for file in type_files:
+        if is_script_file_affected(
+            user_scripts_path, affected_script_keys, file
+        ):
+            roll_script_file(
+                script_runner,
+                get_manifest_key_for_script_file(user_scripts_path, file),
+                file,
+                stage_timer,
+            )
+    for file in view_files:
+        if is_script_file_affected(
+            user_scripts_path, affected_script_keys, file
+        ):
+            process_view_script_file(
+                script_runner,
+                get_manifest_key_for_script_file(user_scripts_path, file),
+                file,
+                stage_timer,
+            )
+    for file in function_files:
+        if is_script_file_affected(
+            user_scripts_path, affected_script_keys, file
+        ):
+            roll_script_file(
+                script_runner,
+                get_manifest_key_for_script_file(user_scripts_path, file),
+                file,
+                stage_timer,
+            )
+
+
+def get_manifest_entry_for_parsed_type_script_file(
+    python_source_root: Path,
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    file_hash: str,
+    parsed_script_file: ParsedScriptFile,
+) -> tuple[ScriptManifestEntry, Optional[ScriptEmitTask]]:
+    postgres_types = parsed_script_file.postgres_types
+    postgres_domains = parsed_script_file.postgres_domains
+    dependencies = get_resolved_dependencies(
+        python_postgres_module_lookup,
+        get_referenced_python_names_for_postgres_types(postgres_types)
+        | get_referenced_python_names_for_postgres_domains(
+            postgres_domains, postgres_types
+        ),
+    )
+    lookup_entries = [
+        (postgres_type.get_python_name(), parsed_script_file.module_name)
+        for postgres_type in postgres_types
+    ] + [
+        (postgres_domain.get_python_name(), parsed_script_file.module_name)
+        for postgres_domain in postgres_domains
+    ]
+    if len(postgres_types) == 0:
+        entry = ScriptManifestEntry(
+            file_hash,
+            None,
+            lookup_entries,
+            dependencies,
+            [],
+            postgres_domains,
+            [],
+        )
+        return entry, None
+    entry = ScriptManifestEntry(
+        file_hash,
+        get_python_file_path_for_module(
+            python_source_root, parsed_script_file.module_name
+        ),
+        lookup_entries,
+        dependencies,
+        postgres_types,
+        postgres_domains,
+        [],
+    )
+    emit_task = ScriptEmitTask(
+        parsed_script_file.script_file,
+        parsed_script_file.module_name,
+        get_lookup_for_resolved_dependencies(dependencies),
+        postgres_types,
+        [],
+    )
+    return entry, emit_task
+
+
+def get_manifest_entry_for_parsed_function_script_file(
+    python_source_root: Path,
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    file_hash: str,
+    parsed_script_file: ParsedScriptFile,
+) -> tuple[ScriptManifestEntry, Optional[ScriptEmitTask]]:
+    postgres_functions = parsed_script_file.postgres_functions
+    dependencies = get_resolved_dependencies(
+        python_postgres_module_lookup,
+        get_referenced_python_names_for_postgres_functions(postgres_functions),
+    )
+    lookup_entries = [
+        (postgres_function.get_python_name(), parsed_script_file.module_name)
+        for postgres_function in postgres_functions
+    ]
+    if len(postgres_functions) == 0:
+        entry = ScriptManifestEntry(
+            file_hash, None, lookup_entries, dependencies, [], [], []
+        )
+        return entry, None
+    entry = ScriptManifestEntry(
+        file_hash,
+        get_python_file_path_for_module(
+            python_source_root, parsed_script_file.module_name
+        ),
+        lookup_entries,
+        dependencies,
+        [],
+        [],
+        postgres_functions,
+    )
+    emit_task = ScriptEmitTask(
+        parsed_script_file.script_file,
+        parsed_script_file.module_name,
+        get_lookup_for_resolved_dependencies(dependencies),
+        [],
+        postgres_functions,
+    )
+    return entry, emit_task
+
+
+def get_manifest_entries_for_script_files(
+    parse_script_file: Callable[[Path], Optional[ParsedScriptFile]],
+    get_manifest_entry_for_parsed_script_file: Callable[
+        [Path, PythonPostgresModuleLookup, str, ParsedScriptFile],
+        tuple[ScriptManifestEntry, Optional[ScriptEmitTask]],
+    ],
+    user_scripts_path: Path,
+    python_source_root: Path,
+    previous_manifest: ScriptManifest,
+    affected_script_keys: Optional[set[str]],
+    file_hashes: dict[Path, str],
+    parsed_script_files: dict[Path, Optional[ParsedScriptFile]],
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    script_files: list[Path],
+) -> tuple[
+    PythonPostgresModuleLookup,
+    list[tuple[str, ScriptManifestEntry]],
+    list[ScriptEmitTask],
+]:
+    entries: list[tuple[str, ScriptManifestEntry]] = []
+    emit_tasks: list[ScriptEmitTask] = []
+    for file in script_files:
+        manifest_key = get_manifest_key_for_script_file(user_scripts_path, file)
+        file_hash = file_hashes[file]
+        entry = get_reusable_manifest_entry(
+            previous_manifest,
+            manifest_key,
+            file_hash,
+            python_postgres_module_lookup,
+        )
+        if entry is not None:
+            if is_script_file_affected(
+                user_scripts_path, affected_script_keys, file
+            ):
+                print(f"Reusing generated code for unchanged file {file}")
+        else:
+            parsed_script_file = (
+                parsed_script_files[file]
+                if file in parsed_script_files
+                else parse_script_file(file)
+            )
+            if parsed_script_file is None:
+                continue
+            entry, emit_task = get_manifest_entry_for_parsed_script_file(
+                python_source_root,
+                python_postgres_module_lookup,
+                file_hash,
+                parsed_script_file,
+            )
+            if emit_task is not None:
+                emit_tasks.append(emit_task)
+        python_postgres_module_lookup = apply_manifest_entry_to_lookup(
+            python_postgres_module_lookup, entry
+        )
+        entries.append((manifest_key, entry))
+    return python_postgres_module_lookup, entries, emit_tasks
+
+
+def get_script_file_hashes(
+    user_scripts_path: Path,
+    previous_manifest: ScriptManifest,
+    affected_script_keys: Optional[set[str]],
+    script_files: list[Path],
+) -> dict[Path, str]:
+    file_hashes: dict[Path, str] = {}
+    for file in script_files:
+        previous_entry = previous_manifest.entries.get(
+            get_manifest_key_for_script_file(user_scripts_path, file)
+        )
+        if previous_entry is not None and not is_script_file_affected(
+            user_scripts_path, affected_script_keys, file
+        ):
+            file_hashes[file] = previous_entry.file_hash
+        else:
+            file_hashes[file] = get_file_hash(file)
+    return file_hashes
+
+
+def get_script_files_to_parse(
+    user_scripts_path: Path,
+    previous_manifest: ScriptManifest,
+    file_hashes: dict[Path, str],
+    script_files: list[Path],
+) -> list[Path]:
+    return [
+        file
+        for file in script_files
+        if not is_manifest_entry_up_to_date(
+            previous_manifest,
+            get_manifest_key_for_script_file(user_scripts_path, file),
+            file_hashes[file],
+        )
+    ]
+
+
 def process_user_script_files(
     python_source_root: Path,
     output_code_module: str,
     user_scripts_path: Path,
-    roll_scripts: bool,
-    db_credentials: Optional[DbCredentials],
-) -> list[Path]:
-    user_files = get_postgres_files_in_directory(user_scripts_path)
-    python_postgres_module_lookup: PythonPostgresModuleLookup = {}
+    script_runner: Optional[ScriptRunner],
+    previous_manifest: Optional[ScriptManifest] = None,
+    affected_script_keys: Optional[set[str]] = None,
+    jobs: int = 1,
+    force_roll: bool = False,
+    stage_timer: Optional[StageTimer] = None,
+    codegen_options: Optional[CodegenOptions] = None,
+) -> tuple[list[Path], list[Path], ScriptManifest]:
+    if codegen_options is None:
+        codegen_options = CodegenOptions()
+    with time_stage(stage_timer, "discover"):
+        user_files = get_postgres_files_in_directory(user_scripts_path)
+    settings = get_manifest_settings(output_code_module, codegen_options)
+    if previous_manifest is None:
+        previous_manifest = get_empty_manifest(settings)
+    with time_stage(stage_timer, "roll"):
+        roll_user_script_files(
+            user_scripts_path,
+            user_files.type_files,
+            user_files.view_files,
+            user_files.function_files,
+            script_runner,
+            affected_script_keys,
+            previous_manifest,
+            force_roll,
+            stage_timer,
+        )
+    with time_stage(stage_timer, "hash"):
+        file_hashes = get_script_file_hashes(
+            user_scripts_path,
+            previous_manifest,
+            affected_script_keys,
+            user_files.type_files + user_files.function_files,
+        )
+        type_files_to_parse = get_script_files_to_parse(
+            user_scripts_path,
+            previous_manifest,
+            file_hashes,
+            user_files.type_files,
+        )
+        function_files_to_parse = get_script_files_to_parse(
+            user_scripts_path,
+            previous_manifest,
+            file_hashes,
+            user_files.function_files,
+        )
+    parse_type_file = partial(
+        parse_type_script_file, user_scripts_path, output_code_module
+    )
+    parse_function_file = partial(
+        parse_function_script_file, user_scripts_path, output_code_module
+    )
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        with time_stage(stage_timer, "parse"):
+            parsed_type_files = map_script_files(
+                executor,
+                jobs,
+                parse_type_file,
+                type_files_to_parse,
+                stage_timer,
+            )
+            parsed_function_files = map_script_files(
+                executor,
+                jobs,
+                parse_function_file,
+                function_files_to_parse,
+                stage_timer,
+            )
+        parsed_script_files = dict(
+            zip(
+                type_files_to_parse + function_files_to_parse,
+                parsed_type_files + parsed_function_files,
+            )
+        )
+        with time_stage(stage_timer, "resolve"):
+            python_postgres_module_lookup, type_entries, type_emit_tasks = (
+                get_manifest_entries_for_script_files(
+                    parse_type_file,
+                    get_manifest_entry_for_parsed_type_script_file,
+                    user_scripts_path,
+                    python_source_root,
+                    previous_manifest,
+                    affected_script_keys,
+                    file_hashes,
+                    parsed_script_files,
+                    {},
+                    user_files.type_files,
+                )
+            )
+            (
+                python_postgres_module_lookup,
+                function_entries,
+                function_emit_tasks,
+            ) = get_manifest_entries_for_script_files(
+                parse_function_file,
+                get_manifest_entry_for_parsed_function_script_file,
+                user_scripts_path,
+                python_source_root,
+                previous_manifest,
+                affected_script_keys,
+                file_hashes,
+                parsed_script_files,
+                python_postgres_module_lookup,
+                user_files.function_files,
+            )
+        emit_tasks = type_emit_tasks + function_emit_tasks
+        with time_stage(stage_timer, "emit"):
+            emitted_files = map_script_files(
+                executor,
+                jobs,
+                partial(emit_script_file, python_source_root, codegen_options),
+                emit_tasks,
+                stage_timer,
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    failed_script_keys = {
+        get_manifest_key_for_script_file(
+            user_scripts_path, emit_task.script_file
+        )
+        for emit_task, emitted_file in zip(emit_tasks, emitted_files)
+        if emitted_file is None
+    }
+    written_files = [
+        emitted_file[0]
+        for emitted_file in emitted_files
+        if emitted_file is not None and emitted_file[1]
+    ]
+    manifest = get_empty_manifest(settings)
     generated_files: list[Path] = []
     postgres_types: list[PostgresType] = []
     postgres_domains: list[PostgresDomain] = []
-    for file in user_files.type_files:
-        type_module_result = process_type_script_file(
-            user_scripts_path,
-            output_code_module,
-            python_source_root,
-            roll_scripts,
-            db_credentials,
-            python_postgres_module_lookup,
-            file,
-        )
-        if type_module_result is None:
+    postgres_functions: list[PostgresFunction] = []
+    for manifest_key, entry in type_entries + function_entries:
+        if manifest_key in failed_script_keys:
             continue
-        python_postgres_module_lookup, module, generated_file_path = type_module_result
-        if generated_file_path is not None:
-            postgres_types.extend(module.module_objects)
-            generated_files.append(generated_file_path)
-        python_postgres_module_lookup, domain_module_result = (
-            get_postgres_module_for_postgres_file(
-                get_postgres_domain_for_statement,
-                get_python_code_for_postgres_domain,
-                user_scripts_path,
+        manifest.entries[manifest_key] = entry
+        if entry.generated_file is not None:
+            generated_files.append(entry.generated_file)
+        postgres_types.extend(entry.postgres_types)
+        postgres_domains.extend(entry.postgres_domains)
+        postgres_functions.extend(entry.postgres_functions)
+    with time_stage(stage_timer, "register"):
+        generated_file_path, is_register_file_written = (
+            process_register_types_file(
+                python_source_root,
                 output_code_module,
                 python_postgres_module_lookup,
-                file,
+                postgres_types,
+                postgres_domains,
+                codegen_options,
             )
         )
-        postgres_domains.extend(domain_module_result.module_objects)
-    generated_file_path = process_register_types_file(
-        python_source_root,
-        output_code_module,
-        python_postgres_module_lookup,
-        postgres_types,
-        postgres_domains,
-    )
     generated_files.append(generated_file_path)
-    for file in user_files.view_files:
-        process_view_script_file(roll_scripts, db_credentials, file)
-    for file in user_files.function_files:
-        type_module_result = process_function_script_file(
-            user_scripts_path,
-            output_code_module,
+    if is_register_file_written:
+        written_files.append(generated_file_path)
+    if is_check_module_generated(codegen_options):
+        with time_stage(stage_timer, "check"):
+            generated_file_path, is_check_file_written = (
+                process_check_functions_file(
+                    python_source_root,
+                    output_code_module,
+                    postgres_functions,
+                    codegen_options,
+                )
+            )
+        generated_files.append(generated_file_path)
+        if is_check_file_written:
+            written_files.append(generated_file_path)
+    return generated_files, written_files, manifest
+
+
+def finish_output_directory(
+    python_source_root: Path,
+    output_code_module: str,
+    manifest_path: Optional[Path],
+    generated_files: list[Path],
+    written_files: list[Path],
+    manifest: ScriptManifest,
+    stage_timer: Optional[StageTimer] = None,
+    codegen_options: Optional[CodegenOptions] = None,
+):
+    if codegen_options is None:
+        codegen_options = CodegenOptions()
+    with time_stage(stage_timer, "py.typed"):
+        generated_py_typed_files = create_py_typed_files_in_directory(
+            python_source_root, output_code_module
+        )
+    generated_init_files: list[Path] = []
+    if codegen_options.lazy_imports:
+        with time_stage(stage_timer, "package init"):
+            generated_init_files = create_package_init_files_in_directory(
+                python_source_root, output_code_module
+            )
+    with time_stage(stage_timer, "clean"):
+        removed_file_count = clean_output_directory(
             python_source_root,
-            roll_scripts,
-            db_credentials,
-            python_postgres_module_lookup,
-            file,
+            output_code_module,
+            generated_files + generated_py_typed_files + generated_init_files,
         )
-        if type_module_result is None:
-            continue
-        _, _, generated_file_path = type_module_result
-        if generated_file_path is not None:
-            generated_files.append(generated_file_path)
-    return generated_files
+    print(
+        f"Wrote {len(written_files)} files, "
+        f"{len(generated_files) - len(written_files)} unchanged, "
+        f"removed {removed_file_count}"
+    )
+    if manifest_path is not None:
+        with time_stage(stage_timer, "save manifest"):
+            save_manifest(manifest_path, manifest)
 
 
 def process_all_script_files(
@@ -254,21 +814,151 @@ def process_all_script_files(
     output_code_module: str,
     roll_scripts: bool,
     db_credentials: Optional[DbCredentials],
+    manifest_path: Optional[Path] = None,
+    jobs: int = 1,
+    roll_mode: str = "connection",
+    force_roll: bool = False,
+    stage_timer: Optional[StageTimer] = None,
+    codegen_options: Optional[CodegenOptions] = None,
 ):
-    process_internal_script_files(resources_path, roll_scripts, db_credentials)
-    copy_python_resources(resources_path, python_source_root, output_code_module)
-    generated_files = process_user_script_files(
+    if codegen_options is None:
+        codegen_options = CodegenOptions()
+    with time_stage(stage_timer, "connect"):
+        script_runner = get_script_runner(
+            roll_scripts, db_credentials, roll_mode
+        )
+    try:
+        with time_stage(stage_timer, "internal scripts"):
+            rolled_internal_file = process_internal_script_files(
+                resources_path, script_runner, force_roll, stage_timer
+            )
+        with time_stage(stage_timer, "copy resources"):
+            copy_python_resources(
+                resources_path, python_source_root, output_code_module
+            )
+        with time_stage(stage_timer, "load manifest"):
+            previous_manifest = (
+                load_manifest(
+                    manifest_path,
+                    get_manifest_settings(output_code_module, codegen_options),
+                )
+                if manifest_path is not None
+                else None
+            )
+        generated_files, written_files, manifest = process_user_script_files(
+            python_source_root,
+            output_code_module,
+            user_scripts_path,
+            script_runner,
+            previous_manifest,
+            jobs=jobs,
+            force_roll=force_roll or rolled_internal_file,
+            stage_timer=stage_timer,
+            codegen_options=codegen_options,
+        )
+        if script_runner is not None:
+            with time_stage(stage_timer, "commit"):
+                script_runner.finish()
+    finally:
+        if script_runner is not None:
+            script_runner.close()
+    finish_output_directory(
         python_source_root,
         output_code_module,
-        user_scripts_path,
-        roll_scripts,
-        db_credentials,
+        manifest_path,
+        generated_files,
+        written_files,
+        manifest,
+        stage_timer,
+        codegen_options,
     )
-    generated_py_typed_files = create_py_typed_files_in_directory(
-        python_source_root, output_code_module
+
+
+def process_changed_script_files(
+    resources_path: Path,
+    user_scripts_path: Path,
+    python_source_root: Path,
+    output_code_module: str,
+    roll_scripts: bool,
+    db_credentials: Optional[DbCredentials],
+    manifest_path: Optional[Path],
+    changed_script_files: set[Path],
+    jobs: int = 1,
+    roll_mode: str = "connection",
+    stage_timer: Optional[StageTimer] = None,
+    codegen_options: Optional[CodegenOptions] = None,
+):
+    if codegen_options is None:
+        codegen_options = CodegenOptions()
+    if manifest_path is None or not manifest_path.is_file():
+        process_all_script_files(
+            resources_path,
+            user_scripts_path,
+            python_source_root,
+            output_code_module,
+            roll_scripts,
+            db_credentials,
+            manifest_path,
+            jobs,
+            roll_mode,
+            stage_timer=stage_timer,
+            codegen_options=codegen_options,
+        )
+        return
+    with time_stage(stage_timer, "load manifest"):
+        previous_manifest = load_manifest(
+            manifest_path,
+            get_manifest_settings(output_code_module, codegen_options),
+        )
+    resolved_user_scripts_path = user_scripts_path.resolve()
+    changed_script_keys = {
+        get_manifest_key_for_script_file(
+            resolved_user_scripts_path, script_file.resolve()
+        )
+        for script_file in changed_script_files
+        if script_file.resolve().is_relative_to(resolved_user_scripts_path)
+    }
+    user_files = get_postgres_files_in_directory(user_scripts_path)
+    affected_script_keys = get_affected_script_keys_for_changed_script_files(
+        user_scripts_path,
+        user_files.type_files,
+        user_files.view_files,
+        previous_manifest,
+        changed_script_keys,
     )
-    clean_output_directory(
+    if affected_script_keys is not None:
+        print(
+            f"Processing {len(affected_script_keys)} script files affected by {len(changed_script_keys)} changed files"
+        )
+    with time_stage(stage_timer, "connect"):
+        script_runner = get_script_runner(
+            roll_scripts, db_credentials, roll_mode
+        )
+    try:
+        generated_files, written_files, manifest = process_user_script_files(
+            python_source_root,
+            output_code_module,
+            user_scripts_path,
+            script_runner,
+            previous_manifest,
+            affected_script_keys,
+            jobs,
+            stage_timer=stage_timer,
+            codegen_options=codegen_options,
+        )
+        if script_runner is not None:
+            with time_stage(stage_timer, "commit"):
+                script_runner.finish()
+    finally:
+        if script_runner is not None:
+            script_runner.close()
+    finish_output_directory(
         python_source_root,
         output_code_module,
-        generated_files + generated_py_typed_files,
+        manifest_path,
+        generated_files,
+        written_files,
+        manifest,
+        stage_timer,
+        codegen_options,
     )
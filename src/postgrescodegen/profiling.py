@@ -0,0 +1,204 @@
+import json
+import os
+import time
+
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from postgrescodegen.classes import StageTiming
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.stage_timings: list[StageTiming] = []
+
+    @contextmanager
+    def time_stage(
+        self, stage_name: str, script_file: Optional[Path] = None
+    ) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_timings.append(
+                StageTiming(
+                    stage_name,
+                    start_time,
+                    time.perf_counter(),
+                    str(script_file) if script_file is not None else None,
+                    os.getpid(),
+                )
+            )
+
+    def get_stage_durations(self) -> dict[str, float]:
+        stage_durations: dict[str, float] = {}
+        for stage_timing in self.stage_timings:
+            if stage_timing.script_name is not None:
+                continue
+            stage_durations[stage_timing.stage_name] = (
+                stage_durations.get(stage_timing.stage_name, 0.0)
+                + stage_timing.end_time
+                - stage_timing.start_time
+            )
+        return stage_durations
+
+
+def time_stage(
+    stage_timer: Optional[StageTimer],
+    stage_name: str,
+    script_file: Optional[Path] = None,
+) -> AbstractContextManager[None]:
+    if stage_timer is None:
+        return nullcontext()
+    return stage_timer.time_stage(stage_name, script_file)
+
+
+def call_with_stage_timer[T, U](
+    function: Callable[[T, Optional[StageTimer]], U], item: T
+) -> tuple[U, list[StageTiming]]:
+    stage_timer = StageTimer()
+    result = function(item, stage_timer)
+    return result, stage_timer.stage_timings
+
+
+def get_stage_timing_duration(stage_timing: StageTiming) -> float:
+    return stage_timing.end_time - stage_timing.start_time
+
+
+def get_stage_summary_rows(
+    stage_timings: list[StageTiming],
+) -> list[tuple[str, int, float, float]]:
+    stage_summaries: dict[str, tuple[int, float, float]] = {}
+    for stage_timing in stage_timings:
+        stage_key = (
+            stage_timing.stage_name
+            if stage_timing.script_name is None
+            else f"{stage_timing.stage_name} (per file)"
+        )
+        count, total_duration, max_duration = stage_summaries.get(
+            stage_key, (0, 0.0, 0.0)
+        )
+        duration = get_stage_timing_duration(stage_timing)
+        stage_summaries[stage_key] = (
+            count + 1,
+            total_duration + duration,
+            max(max_duration, duration),
+        )
+    return sorted(
+        [
+            (stage_key, count, total_duration, max_duration)
+            for stage_key, (count, total_duration, max_duration) in (
+                stage_summaries.items()
+            )
+        ],
+        key=lambda row: row[2],
+        reverse=True,
+    )
+
+
+def print_profile_summary(
+    stage_timer: StageTimer, slowest_file_count: int = 10
+):
+    summary_rows = get_stage_summary_rows(stage_timer.stage_timings)
+    stage_key_width = max(
+        [len("Stage")] + [len(row[0]) for row in summary_rows]
+    )
+    print("Profile summary:")
+    print(
+        f"  {'Stage':<{stage_key_width}} {'Count':>7} "
+        f"{'Total (ms)':>12} {'Max (ms)':>10}"
+    )
+    for stage_key, count, total_duration, max_duration in summary_rows:
+        print(
+            f"  {stage_key:<{stage_key_width}} {count:>7} "
+            f"{total_duration * 1000:>12.1f} {max_duration * 1000:>10.1f}"
+        )
+    slowest_file_timings = sorted(
+        [
+            stage_timing
+            for stage_timing in stage_timer.stage_timings
+            if stage_timing.script_name is not None
+        ],
+        key=get_stage_timing_duration,
+        reverse=True,
+    )[:slowest_file_count]
+    if len(slowest_file_timings) == 0:
+        return
+    print("Slowest files:")
+    for stage_timing in slowest_file_timings:
+        print(
+            f"  {get_stage_timing_duration(stage_timing) * 1000:>10.1f} ms "
+            f"{stage_timing.stage_name:<8} {stage_timing.script_name}"
+        )
+
+
+def get_chrome_trace_events(stage_timer: StageTimer) -> list[dict[str, Any]]:
+    if len(stage_timer.stage_timings) == 0:
+        return []
+    trace_start_time = min(
+        stage_timing.start_time for stage_timing in stage_timer.stage_timings
+    )
+    main_process_id = os.getpid()
+    process_ids = sorted(
+        {stage_timing.process_id for stage_timing in stage_timer.stage_timings}
+    )
+    metadata_events: list[dict[str, Any]] = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": process_id,
+            "tid": process_id,
+            "args": {
+                "name": (
+                    "postgrescodegen"
+                    if process_id == main_process_id
+                    else f"worker {process_id}"
+                )
+            },
+        }
+        for process_id in process_ids
+    ]
+    stage_events: list[dict[str, Any]] = [
+        {
+            "name": (
+                stage_timing.stage_name
+                if stage_timing.script_name is None
+                else f"{stage_timing.stage_name} {stage_timing.script_name}"
+            ),
+            "cat": "file" if stage_timing.script_name is not None else "stage",
+            "ph": "X",
+            "ts": (stage_timing.start_time - trace_start_time) * 1_000_000,
+            "dur": get_stage_timing_duration(stage_timing) * 1_000_000,
+            "pid": stage_timing.process_id,
+            "tid": stage_timing.process_id,
+            "args": (
+                {"script_file": stage_timing.script_name}
+                if stage_timing.script_name is not None
+                else {}
+            ),
+        }
+        for stage_timing in sorted(
+            stage_timer.stage_timings,
+            key=lambda stage_timing: stage_timing.start_time,
+        )
+    ]
+    return metadata_events + stage_events
+
+
+def write_chrome_trace(stage_timer: StageTimer, trace_path: Path):
+    trace_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(trace_path, "w") as f:
+        json.dump(
+            {
+                "traceEvents": get_chrome_trace_events(stage_timer),
+                "displayTimeUnit": "ms",
+            },
+            f,
+        )
+
+
+def report_profile(stage_timer: StageTimer, trace_path: Path):
+    print_profile_summary(stage_timer)
+    write_chrome_trace(stage_timer, trace_path)
+    print(f"Wrote profile trace to {trace_path}")
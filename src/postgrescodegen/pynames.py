@@ -7,6 +7,17 @@ def get_python_name_for_postgres_type_name(postgres_type_name: str) -> str:
     return snake_case_name
 
 
+def get_python_to_tuple_function_name_for_postgres_type_name(
+    postgres_type_name: str,
+) -> str:
+    base_type_name = postgres_type_name.lower()
+    if base_type_name[-2:] == "[]":
+        base_type_name = base_type_name[:-2]
+    if base_type_name[-8:] == "_notnull":
+        base_type_name = base_type_name[:-8]
+    return f"{base_type_name}_to_tuple"
+
+
 def get_python_name_for_postgres_function_name(
     postgres_function_name: str,
 ) -> str:
@@ -24,6 +24,15 @@ postgres_to_python_type_dict = {
 }
 
 
+python_to_numpy_dtype_dict = {
+    "int": "int64",
+    "Decimal": "float64",
+    "datetime": "datetime64[us]",
+    "timedelta": "timedelta64[us]",
+    "bool": "bool",
+}
+
+
 def get_python_type_for_base_type_of_postgres_type(
     postgres_type_name: str,
 ) -> Optional[str]:
@@ -71,3 +80,16 @@ def get_base_python_type_for_python_type(python_type: str) -> str:
     if len(python_type) > 9 and python_type[:9] == "Optional[":
         return get_base_python_type_for_python_type(python_type[9:-1])
     return python_type
+
+
+def get_numpy_dtype_for_postgres_type(type_string: str) -> str:
+    if is_postgres_array_type(type_string):
+        return "O"
+    base_python_type = get_base_python_type_for_postgres_type(type_string)
+    numpy_dtype = python_to_numpy_dtype_dict.get(base_python_type, "O")
+    if is_postgres_type_nullable(type_string) and numpy_dtype in [
+        "int64",
+        "bool",
+    ]:
+        return "O"
+    return numpy_dtype
@@ -1,4 +1,5 @@
 from postgrescodegen.classes import (
+    CodegenOptions,
     PostgresDomain,
     PostgresType,
     PsycopgDomainDetails,
@@ -15,30 +16,172 @@ from postgrescodegen.generator import (
 
 tab = "    "
 
+type_info_query_lines = [
+    "SELECT",
+    f"{tab}r.type_name,",
+    f"{tab}t.typname AS name,",
+    f"{tab}t.oid AS oid,",
+    f"{tab}t.typarray AS array_oid,",
+    f"{tab}t.oid::regtype::text AS regtype,",
+    f"{tab}t.typdelim::text AS delimiter,",
+    f"{tab}coalesce(a.field_names, '{{}}') AS field_names,",
+    f"{tab}coalesce(a.field_types, '{{}}') AS field_types",
+    "FROM unnest(%(type_names)s::text[]) AS r(type_name)",
+    "JOIN pg_type t ON t.oid = to_regtype(r.type_name)",
+    "LEFT JOIN LATERAL (",
+    f"{tab}SELECT",
+    f"{tab * 2}array_agg(a.attname ORDER BY a.attnum) AS field_names,",
+    f"{tab * 2}array_agg(a.atttypid ORDER BY a.attnum) AS field_types",
+    f"{tab}FROM pg_attribute a",
+    f"{tab}WHERE a.attrelid = t.typrelid",
+    f"{tab}AND a.attnum > 0",
+    f"{tab}AND NOT a.attisdropped",
+    ") a ON true",
+]
+
+
+def get_register_function_prefix(is_async: bool) -> str:
+    return "async def" if is_async else "def"
+
+
+def get_register_function_suffix(is_async: bool) -> str:
+    return "_async" if is_async else ""
+
+
+def get_register_connection_type(is_async: bool) -> str:
+    return "AsyncConnection" if is_async else "Connection"
+
+
+def get_register_await(is_async: bool) -> str:
+    return "await " if is_async else ""
+
+
+def get_register_composite_arguments(is_binary: bool) -> str:
+    if is_binary:
+        return "conn, factory, make_sequence=get_composite_fields"
+    return "conn, factory"
+
+
+def get_type_info_query_constant() -> str:
+    query = "\n".join(type_info_query_lines)
+    return f'type_info_query = """\n{query}\n"""'
+
+
+def get_registered_type_names(
+    postgres_types: list[PostgresType], postgres_domains: list[PostgresDomain]
+) -> list[str]:
+    type_names = (
+        [postgres_type.type_name for postgres_type in postgres_types]
+        + [domain.domain_name for domain in primitive_notnull_domains]
+        + [
+            type_name
+            for postgres_domain in postgres_domains
+            for type_name in [
+                postgres_domain.domain_name,
+                postgres_domain.underlying_type,
+            ]
+        ]
+    )
+    return list(dict.fromkeys(type_names))
+
+
+def get_registered_type_names_constant(
+    postgres_types: list[PostgresType], postgres_domains: list[PostgresDomain]
+) -> str:
+    type_name_lines = "".join(
+        f'{tab}"{type_name}",\n'
+        for type_name in get_registered_type_names(
+            postgres_types, postgres_domains
+        )
+    )
+    return f"registered_type_names = [\n{type_name_lines}]"
+
 
-def get_register_composite_type_function() -> str:
+def get_composite_fields_function() -> str:
     lines = [
-        "def register_composite_type(conn: Connection, type_name: str, factory: type):",
-        f"{tab}info = CompositeInfo.fetch(conn, type_name)",
+        "def get_composite_fields(obj: Any, info: CompositeInfo) -> tuple[Any, ...]:",
+        f"{tab}return tuple(getattr(obj, field.name) for field in fields(obj))",
+    ]
+    return "\n".join(lines)
+
+
+def get_fetch_type_info_records_function(is_async: bool) -> str:
+    prefix = get_register_function_prefix(is_async)
+    suffix = get_register_function_suffix(is_async)
+    connection_type = get_register_connection_type(is_async)
+    await_keyword = get_register_await(is_async)
+    with_keyword = "async with" if is_async else "with"
+    lines = [
+        f"{prefix} fetch_type_info_records{suffix}(conn: {connection_type}) -> dict[str, dict[str, Any]]:",
+        f"{tab}{with_keyword} conn.transaction():",
+        f"{tab * 2}{with_keyword} conn.cursor(row_factory=dict_row) as cur:",
+        f'{tab * 3}{await_keyword}cur.execute(type_info_query, {{"type_names": registered_type_names}})',
+        f"{tab * 3}records = {await_keyword}cur.fetchall()",
+        f'{tab}return {{record.pop("type_name"): record for record in records}}',
+    ]
+    return "\n".join(lines)
+
+
+def get_composite_info_function() -> str:
+    lines = [
+        "def get_composite_info(type_info_records: dict[str, dict[str, Any]], type_name: str) -> Optional[CompositeInfo]:",
+        f"{tab}record = type_info_records.get(type_name)",
+        f"{tab}if record is None:",
+        f"{tab * 2}return None",
+        f"{tab}return CompositeInfo(",
+        f'{tab * 2}record["name"],',
+        f'{tab * 2}record["oid"],',
+        f'{tab * 2}record["array_oid"],',
+        f'{tab * 2}regtype=record["regtype"],',
+        f'{tab * 2}field_names=record["field_names"],',
+        f'{tab * 2}field_types=record["field_types"],',
+        f"{tab})",
+    ]
+    return "\n".join(lines)
+
+
+def get_type_info_function() -> str:
+    lines = [
+        "def get_type_info(type_info_records: dict[str, dict[str, Any]], type_name: str) -> Optional[TypeInfo]:",
+        f"{tab}record = type_info_records.get(type_name)",
+        f"{tab}if record is None:",
+        f"{tab * 2}return None",
+        f"{tab}return TypeInfo(",
+        f'{tab * 2}record["name"],',
+        f'{tab * 2}record["oid"],',
+        f'{tab * 2}record["array_oid"],',
+        f'{tab * 2}regtype=record["regtype"],',
+        f'{tab * 2}delimiter=record["delimiter"],',
+        f"{tab})",
+    ]
+    return "\n".join(lines)
+
+
+def get_register_composite_type_function(is_binary: bool) -> str:
+    register_arguments = get_register_composite_arguments(is_binary)
+    lines = [
+        "def register_composite_type(conn: AdaptContext, type_info_records: dict[str, dict[str, Any]], type_name: str, factory: type):",
+        f"{tab}info = get_composite_info(type_info_records, type_name)",
         f"{tab}if info is not None:",
-        f"{tab * 2}register_composite(info, conn, factory)",
+        f"{tab * 2}register_composite(info, {register_arguments})",
         f"{tab}else:",
         f'{tab*2}raise RuntimeError(f"Could not find composite type {{type_name}}")',
     ]
     return "\n".join(lines)
 
 
-def get_register_composite_domain_function() -> str:
+def get_register_composite_domain_function(is_binary: bool) -> str:
+    register_arguments = get_register_composite_arguments(is_binary)
     lines = [
-        "def register_composite_domain_type(conn: Connection, domain_name: str, underlying_type_name: str, factory: type):",
-        f"{tab}domain_info = CompositeInfo.fetch(conn, domain_name)",
-        f"{tab}underlying_type_info = CompositeInfo.fetch(conn, underlying_type_name)",
+        "def register_composite_domain_type(conn: AdaptContext, type_info_records: dict[str, dict[str, Any]], domain_name: str, underlying_type_name: str, factory: type):",
+        f"{tab}domain_info = get_composite_info(type_info_records, domain_name)",
+        f"{tab}underlying_type_info = get_composite_info(type_info_records, underlying_type_name)",
         f"{tab}if domain_info is not None and underlying_type_info is not None:",
         f"{tab * 2}domain_info.register(conn)",
         f"{tab * 2}domain_info.field_names = underlying_type_info.field_names",
         f"{tab * 2}domain_info.field_types = underlying_type_info.field_types",
         f"{tab * 2}domain_info.array_oid = underlying_type_info.array_oid",
-        f"{tab * 2}register_composite(domain_info, conn, factory)",
+        f"{tab * 2}register_composite(domain_info, {register_arguments})",
         f"{tab}elif domain_info is None:",
         f'{tab*2}raise RuntimeError(f"Could not find domain {{domain_name}}")',
         f"{tab}else:",
@@ -47,14 +190,23 @@ def get_register_composite_domain_function() -> str:
     return "\n".join(lines)
 
 
-def get_register_domain_type_function() -> str:
+def get_register_domain_type_function(is_binary: bool) -> str:
+    if is_binary:
+        declaration = "def register_domain_type(conn: AdaptContext, type_info_records: dict[str, dict[str, Any]], domain_name: str, loader: Optional[type], binary_loader: type):"
+        binary_loader_lines = [
+            f"{tab * 2}conn.adapters.register_loader(domain_name, binary_loader)"
+        ]
+    else:
+        declaration = "def register_domain_type(conn: AdaptContext, type_info_records: dict[str, dict[str, Any]], domain_name: str, loader: Optional[type]):"
+        binary_loader_lines = []
     lines = [
-        "def register_domain_type(conn: Connection, domain_name: str, loader: Optional[type]):",
-        f"{tab}info = TypeInfo.fetch(conn, domain_name)",
+        declaration,
+        f"{tab}info = get_type_info(type_info_records, domain_name)",
         f"{tab}if info is not None:",
         f"{tab * 2}info.register(conn)",
         f"{tab * 2}if loader is not None:",
         f"{tab * 3}conn.adapters.register_loader(domain_name, loader)",
+        *binary_loader_lines,
         f"{tab}else:",
         f'{tab*2}raise RuntimeError(f"Could not find domain type {{domain_name}}")',
     ]
@@ -64,46 +216,68 @@ def get_register_domain_type_function() -> str:
 def get_register_type_function_call(
     indent: int, postgres_type: PythonablePostgresObject
 ) -> str:
-    return f'{tab * indent}register_composite_type(conn, "{postgres_type.get_name()}", {postgres_type.get_python_name()})'
+    return f'{tab * indent}register_composite_type(conn, type_info_records, "{postgres_type.get_name()}", {postgres_type.get_python_name()})'
 
 
 def get_register_domain_type_function_call(
-    indent: int, domain_details: PsycopgDomainDetails
+    indent: int, domain_details: PsycopgDomainDetails, is_binary: bool
 ) -> str:
     loader_string = (
         domain_details.loader.loader_name if domain_details.loader else "None"
     )
-    return f'{tab * indent}register_domain_type(conn, "{domain_details.domain_name}", {loader_string})'
+    if is_binary:
+        loader_string = (
+            f"{loader_string}, {domain_details.binary_loader.loader_name}"
+        )
+    return f'{tab * indent}register_domain_type(conn, type_info_records, "{domain_details.domain_name}", {loader_string})'
 
 
 def get_register_composite_domain_type_function_call(
     indent: int, postgres_domain: PostgresDomain
 ) -> str:
-    return f'{tab * indent}register_composite_domain_type(conn, "{postgres_domain.domain_name}", "{postgres_domain.underlying_type}", {postgres_domain.get_python_name()})'
+    return f'{tab * indent}register_composite_domain_type(conn, type_info_records, "{postgres_domain.domain_name}", "{postgres_domain.underlying_type}", {postgres_domain.get_python_name()})'
 
 
 primitive_notnull_domains = [
-    PsycopgDomainDetails("text_notnull", None),
     PsycopgDomainDetails(
-        "integer_notnull", PsycopgLoader("IntLoader", "psycopg.types.numeric")
+        "text_notnull",
+        None,
+        PsycopgLoader("TextBinaryLoader", "psycopg.types.string"),
     ),
     PsycopgDomainDetails(
-        "bigint_notnull", PsycopgLoader("IntLoader", "psycopg.types.numeric")
+        "integer_notnull",
+        PsycopgLoader("IntLoader", "psycopg.types.numeric"),
+        PsycopgLoader("Int4BinaryLoader", "psycopg.types.numeric"),
     ),
     PsycopgDomainDetails(
-        "decimal_notnull", PsycopgLoader("NumericLoader", "psycopg.types.numeric")
+        "bigint_notnull",
+        PsycopgLoader("IntLoader", "psycopg.types.numeric"),
+        PsycopgLoader("Int8BinaryLoader", "psycopg.types.numeric"),
     ),
     PsycopgDomainDetails(
-        "timestamp_notnull", PsycopgLoader("TimestamptzLoader", "psycopg.types.datetime")
+        "decimal_notnull",
+        PsycopgLoader("NumericLoader", "psycopg.types.numeric"),
+        PsycopgLoader("NumericBinaryLoader", "psycopg.types.numeric"),
     ),
     PsycopgDomainDetails(
-        "interval_notnull", PsycopgLoader("IntervalLoader", "psycopg.types.datetime")
+        "timestamp_notnull",
+        PsycopgLoader("TimestamptzLoader", "psycopg.types.datetime"),
+        PsycopgLoader("TimestamptzBinaryLoader", "psycopg.types.datetime"),
     ),
     PsycopgDomainDetails(
-        "daterange_notnull", PsycopgLoader("DateRangeLoader", "psycopg.types.range")
+        "interval_notnull",
+        PsycopgLoader("IntervalLoader", "psycopg.types.datetime"),
+        PsycopgLoader("IntervalBinaryLoader", "psycopg.types.datetime"),
     ),
     PsycopgDomainDetails(
-        "boolean_notnull", PsycopgLoader("BoolLoader", "psycopg.types.bool")
+        "daterange_notnull",
+        PsycopgLoader("DateRangeLoader", "psycopg.types.range"),
+        PsycopgLoader("DateRangeBinaryLoader", "psycopg.types.range"),
+    ),
+    PsycopgDomainDetails(
+        "boolean_notnull",
+        PsycopgLoader("BoolLoader", "psycopg.types.bool"),
+        PsycopgLoader("BoolBinaryLoader", "psycopg.types.bool"),
     ),
 ]
 
@@ -112,13 +286,14 @@ def get_register_types_function_calls(
     indent: int,
     postgres_types: list[PostgresType],
     postgres_domains: list[PostgresDomain],
+    is_binary: bool,
 ) -> str:
     python_type_registers = "\n".join(
         get_register_type_function_call(indent, postgres_type)
         for postgres_type in postgres_types
     )
     python_primitive_notnull_domain_registers = "\n".join(
-        get_register_domain_type_function_call(indent, domain)
+        get_register_domain_type_function_call(indent, domain, is_binary)
         for domain in primitive_notnull_domains
     )
     python_domain_composite_registers = "\n".join(
@@ -145,71 +320,225 @@ def update_python_type_import_dict_for_type_name(
     return import_dict
 
 
-def get_register_types_imports(
+def update_python_type_import_dict_for_loader(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    loader: PsycopgLoader,
+    import_dict: PythonImportDict,
+) -> PythonImportDict:
+    python_postgres_module_lookup[loader.loader_name] = loader.loader_module
+    return update_python_type_import_dict_for_type_name(
+        python_postgres_module_lookup, loader, import_dict
+    )
+
+
+def update_python_type_import_dict_for_factories(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_types: list[PostgresType],
     postgres_domains: list[PostgresDomain],
-) -> str:
-    import_dict: PythonImportDict = {}
+    import_dict: PythonImportDict,
+) -> PythonImportDict:
     for postgres_type in postgres_types:
         import_dict = update_python_type_import_dict_for_type_name(
             python_postgres_module_lookup, postgres_type, import_dict
         )
+    for postgres_domain in postgres_domains:
+        import_dict = update_python_type_import_dict_for_type_name(
+            python_postgres_module_lookup, postgres_domain, import_dict
+        )
+    return import_dict
+
+
+def get_register_types_imports(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    postgres_types: list[PostgresType],
+    postgres_domains: list[PostgresDomain],
+    is_binary: bool,
+    is_lazy: bool,
+) -> str:
+    import_dict: PythonImportDict = {}
+    if not is_lazy:
+        import_dict = update_python_type_import_dict_for_factories(
+            python_postgres_module_lookup,
+            postgres_types,
+            postgres_domains,
+            import_dict,
+        )
     for primitive_domain in primitive_notnull_domains:
         if primitive_domain.loader is not None:
-            python_postgres_module_lookup[primitive_domain.loader.loader_name] = (
-                primitive_domain.loader.loader_module
-            )
-            import_dict = update_python_type_import_dict_for_type_name(
+            import_dict = update_python_type_import_dict_for_loader(
                 python_postgres_module_lookup,
                 primitive_domain.loader,
                 import_dict,
             )
-    for postgres_domain in postgres_domains:
-        import_dict = update_python_type_import_dict_for_type_name(
-            python_postgres_module_lookup, postgres_domain, import_dict
-        )
+        if is_binary:
+            import_dict = update_python_type_import_dict_for_loader(
+                python_postgres_module_lookup,
+                primitive_domain.binary_loader,
+                import_dict,
+            )
     return get_import_statements_for_python_import_dict(import_dict)
 
 
-def get_register_all_types_function(
+def get_register_factory_imports(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
+    postgres_types: list[PostgresType],
+    postgres_domains: list[PostgresDomain],
+) -> str:
+    import_dict = update_python_type_import_dict_for_factories(
+        python_postgres_module_lookup, postgres_types, postgres_domains, {}
+    )
+    import_statements = get_import_statements_for_python_import_dict(
+        import_dict
+    )
+    return "\n".join(f"{tab}{line}" for line in import_statements.split("\n"))
+
+
+def get_register_type_adapters_function(
+    python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_types: list[PostgresType],
     postgres_domains: list[PostgresDomain],
+    is_binary: bool,
+    is_lazy: bool,
 ) -> str:
-    function_declaration = "def register_types(conn: Connection):"
-    return f"{function_declaration}\n{get_register_types_function_calls(1, postgres_types, postgres_domains)}"
+    function_declaration = "def register_type_adapters(conn: AdaptContext, type_info_records: dict[str, dict[str, Any]]):"
+    function_calls = get_register_types_function_calls(
+        1, postgres_types, postgres_domains, is_binary
+    )
+    if is_lazy and (len(postgres_types) > 0 or len(postgres_domains) > 0):
+        factory_imports = get_register_factory_imports(
+            python_postgres_module_lookup, postgres_types, postgres_domains
+        )
+        return f"{function_declaration}\n{factory_imports}\n\n{function_calls}"
+    return f"{function_declaration}\n{function_calls}"
+
+
+def get_register_all_types_function(is_async: bool) -> str:
+    prefix = get_register_function_prefix(is_async)
+    suffix = get_register_function_suffix(is_async)
+    connection_type = get_register_connection_type(is_async)
+    await_keyword = get_register_await(is_async)
+    lines = [
+        f"{prefix} register_types{suffix}(conn: {connection_type}):",
+        f"{tab}type_info_records = {await_keyword}fetch_type_info_records{suffix}(conn)",
+        f"{tab}register_type_adapters(conn, type_info_records)",
+    ]
+    return "\n".join(lines)
+
+
+def get_last_registered_type_name(
+    postgres_domains: list[PostgresDomain],
+) -> str:
+    if len(postgres_domains) > 0:
+        return postgres_domains[-1].domain_name
+    return primitive_notnull_domains[-1].domain_name
+
+
+def get_shared_type_adapters_constants() -> str:
+    lines = [
+        "type_adapters = AdaptersMap(adapters)",
+        "type_adapters_records: Optional[dict[str, dict[str, Any]]] = None",
+        "type_adapters_lock = Lock()",
+    ]
+    return "\n".join(lines)
+
+
+def get_configure_pool_function(
+    postgres_domains: list[PostgresDomain], is_async: bool
+) -> str:
+    prefix = get_register_function_prefix(is_async)
+    suffix = get_register_function_suffix(is_async)
+    connection_type = get_register_connection_type(is_async)
+    await_keyword = get_register_await(is_async)
+    last_registered_type_name = get_last_registered_type_name(postgres_domains)
+    lines = [
+        f"{prefix} configure_pool{suffix}(conn: {connection_type}):",
+        f"{tab}global type_adapters_records",
+        f"{tab}type_info_records = type_adapters_records",
+        f"{tab}if type_info_records is None:",
+        f"{tab * 2}type_info_records = {await_keyword}fetch_type_info_records{suffix}(conn)",
+        f"{tab * 2}with type_adapters_lock:",
+        f"{tab * 3}if type_adapters_records is None:",
+        f"{tab * 4}register_type_adapters(type_adapters, type_info_records)",
+        f"{tab * 4}type_adapters_records = type_info_records",
+        f'{tab}if conn.adapters.types.get("{last_registered_type_name}") is None:',
+        f"{tab * 2}register_type_adapters(conn, type_info_records)",
+    ]
+    return "\n".join(lines)
 
 
 def get_register_module_code(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_types: list[PostgresType],
     postgres_domains: list[PostgresDomain],
+    codegen_options: CodegenOptions,
 ) -> str:
+    python_imports = "\n".join(
+        (["from dataclasses import fields"] if codegen_options.binary else [])
+        + ["from threading import Lock", "from typing import Any, Optional"]
+    )
     psycopg_imports = "\n".join(
         [
-            "from typing import Optional",
+            python_imports,
             "\n",
-            "from psycopg import Connection",
+            (
+                "from psycopg import AsyncConnection, Connection, adapters"
+                if codegen_options.generate_async
+                else "from psycopg import Connection, adapters"
+            ),
+            "from psycopg.abc import AdaptContext",
+            "from psycopg.adapt import AdaptersMap",
+            "from psycopg.rows import dict_row",
             "from psycopg.types import TypeInfo",
             "from psycopg.types.composite import CompositeInfo, register_composite",
         ]
     )
     type_imports = get_register_types_imports(
-        python_postgres_module_lookup, postgres_types, postgres_domains
+        python_postgres_module_lookup,
+        postgres_types,
+        postgres_domains,
+        codegen_options.binary,
+        codegen_options.lazy_imports,
     )
     imports = "\n\n".join([psycopg_imports, type_imports])
-    register_composite_type_function = get_register_composite_type_function()
-    register_domain_type_function = get_register_domain_type_function()
-    register_composite_domain_function = get_register_composite_domain_function()
-    register_all_types_function = get_register_all_types_function(
-        postgres_types, postgres_domains
+    register_sections = [
+        imports,
+        get_type_info_query_constant(),
+        get_registered_type_names_constant(postgres_types, postgres_domains),
+        get_shared_type_adapters_constants(),
+    ]
+    if codegen_options.binary:
+        register_sections.append(get_composite_fields_function())
+    register_sections.append(
+        get_fetch_type_info_records_function(is_async=False)
     )
-    return "\n\n\n".join(
+    if codegen_options.generate_async:
+        register_sections.append(
+            get_fetch_type_info_records_function(is_async=True)
+        )
+    register_sections.extend(
         [
-            imports,
-            register_composite_type_function,
-            register_composite_domain_function,
-            register_domain_type_function,
-            register_all_types_function,
+            get_composite_info_function(),
+            get_type_info_function(),
+            get_register_composite_type_function(codegen_options.binary),
+            get_register_composite_domain_function(codegen_options.binary),
+            get_register_domain_type_function(codegen_options.binary),
+            get_register_type_adapters_function(
+                python_postgres_module_lookup,
+                postgres_types,
+                postgres_domains,
+                codegen_options.binary,
+                codegen_options.lazy_imports,
+            ),
+            get_register_all_types_function(is_async=False),
         ]
     )
+    if codegen_options.generate_async:
+        register_sections.append(get_register_all_types_function(is_async=True))
+    register_sections.append(
+        get_configure_pool_function(postgres_domains, is_async=False)
+    )
+    if codegen_options.generate_async:
+        register_sections.append(
+            get_configure_pool_function(postgres_domains, is_async=True)
+        )
+    return "\n\n\n".join(register_sections)
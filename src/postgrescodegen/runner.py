@@ -1,12 +1,20 @@
 import os
 import subprocess
+from abc import abstractmethod
 from pathlib import Path
-from typing import Mapping
+from typing import Mapping, Optional
+
+import psycopg
 
 from postgrescodegen.classes import DbCredentials
+from postgrescodegen.ledger import RollLedger
+
+roll_modes = ["connection", "transaction", "psql"]
 
 
-def run_in_script_file(db_credentials: DbCredentials, script_file: Path):
+def run_in_script_file(
+    db_credentials: DbCredentials, script_file: Path
+) -> bool:
     print(f"Running in {script_file}")
     env: Mapping[str, str] = dict(os.environ)
     env["PGPASSWORD"] = db_credentials.password
@@ -22,6 +30,9 @@ def run_in_script_file(db_credentials: DbCredentials, script_file: Path):
                 db_credentials.name,
                 "-U",
                 db_credentials.user,
+                "-v",
+                "ON_ERROR_STOP=1",
+                "-1",
                 "-f",
                 str(script_file),
                 "-q",
@@ -34,5 +45,137 @@ def run_in_script_file(db_credentials: DbCredentials, script_file: Path):
         error_output = e.output.decode("utf-8")
         print(error_output, flush=True)
         print()
+        return False
     else:
+        return True
+
+
+def connect_to_db(
+    db_credentials: DbCredentials, autocommit: bool = True
+) -> psycopg.Connection:
+    return psycopg.connect(
+        host=db_credentials.host,
+        port=db_credentials.port,
+        dbname=db_credentials.name,
+        user=db_credentials.user,
+        password=db_credentials.password,
+        autocommit=autocommit,
+    )
+
+
+class ScriptRunner:
+    ledger: Optional[RollLedger] = None
+
+    @abstractmethod
+    def run_in_script_file(self, script_file: Path) -> bool:
         pass
+
+    def finish(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class PsqlScriptRunner(ScriptRunner):
+    def __init__(self, db_credentials: DbCredentials):
+        self.db_credentials = db_credentials
+        try:
+            self.ledger_conn: Optional[psycopg.Connection] = connect_to_db(
+                db_credentials
+            )
+            self.ledger = RollLedger(self.ledger_conn)
+        except psycopg.Error as e:
+            print(f"Could not open the roll ledger, rolling all scripts: {e}")
+            self.ledger_conn = None
+
+    def run_in_script_file(self, script_file: Path) -> bool:
+        return run_in_script_file(self.db_credentials, script_file)
+
+    def close(self):
+        if self.ledger_conn is not None:
+            self.ledger_conn.close()
+
+
+class ConnectionScriptRunner(ScriptRunner):
+    def __init__(self, db_credentials: DbCredentials):
+        self.db_credentials = db_credentials
+        self.conn = connect_to_db(db_credentials)
+        self.ledger = RollLedger(self.conn)
+
+    def run_in_script_file(self, script_file: Path) -> bool:
+        print(f"Running in {script_file}")
+        with open(script_file, "rb") as f:
+            script_contents = f.read()
+        if self.conn.broken:
+            self.conn = connect_to_db(self.db_credentials)
+            self.ledger = RollLedger(self.conn)
+        try:
+            self.conn.execute(script_contents)
+        except psycopg.Error as e:
+            print(f"Error while running in {script_file}", flush=True)
+            print(e, flush=True)
+            print()
+            return False
+        return True
+
+    def close(self):
+        self.conn.close()
+
+
+class TransactionScriptRunner(ConnectionScriptRunner):
+    def __init__(self, db_credentials: DbCredentials):
+        self.db_credentials = db_credentials
+        self.conn = connect_to_db(db_credentials, autocommit=False)
+        self.ledger = RollLedger(self.conn)
+        self.failed_script_files: list[Path] = []
+
+    def run_in_script_file(self, script_file: Path) -> bool:
+        print(f"Running in {script_file}")
+        with open(script_file, "rb") as f:
+            script_contents = f.read()
+        self.conn.execute("SAVEPOINT script_file")
+        try:
+            self.conn.execute(script_contents)
+        except psycopg.Error as e:
+            print(f"Error while running in {script_file}", flush=True)
+            print(e, flush=True)
+            print()
+            self.conn.execute("ROLLBACK TO SAVEPOINT script_file")
+            self.failed_script_files.append(script_file)
+            return False
+        self.conn.execute("RELEASE SAVEPOINT script_file")
+        return True
+
+    def finish(self):
+        if len(self.failed_script_files) > 0:
+            print(
+                f"Rolling back all scripts as {len(self.failed_script_files)} failed:",
+                flush=True,
+            )
+            for script_file in self.failed_script_files:
+                print(f"  {script_file}", flush=True)
+            self.conn.rollback()
+        else:
+            print("Committing all scripts", flush=True)
+            self.conn.commit()
+        self.failed_script_files = []
+
+
+def get_script_runner(
+    roll_scripts: bool, db_credentials: Optional[DbCredentials], roll_mode: str
+) -> Optional[ScriptRunner]:
+    if not roll_scripts or db_credentials is None:
+        return None
+    if roll_mode == "psql":
+        return PsqlScriptRunner(db_credentials)
+    try:
+        if roll_mode == "transaction":
+            return TransactionScriptRunner(db_credentials)
+        return ConnectionScriptRunner(db_credentials)
+    except psycopg.Error as e:
+        print(
+            f"Could not connect to the db, falling back to psql: {e}",
+            flush=True,
+        )
+        return PsqlScriptRunner(db_credentials)
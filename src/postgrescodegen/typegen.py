@@ -1,25 +1,29 @@
-from pathlib import Path
 import re
 from typing import Optional
 
 from postgrescodegen.classes import (
+    CodegenOptions,
     PostgresType,
     PostgresTypeField,
     PythonImportDict,
-    PythonPostgresModule,
     PythonPostgresModuleLookup,
 )
 from postgrescodegen.generator import (
     get_import_statements_for_python_import_dict,
-    get_postgres_module_for_postgres_file,
     update_python_type_import_dict,
 )
 from postgrescodegen.pgtypes import (
     get_base_postgres_type_for_postgres_type,
+    is_postgres_array_type,
+    is_postgres_type_nullable,
     is_user_defined_type,
 )
+from postgrescodegen.pynames import (
+    get_python_to_tuple_function_name_for_postgres_type_name,
+)
 from postgrescodegen.pytypes import (
     get_base_python_type_for_postgres_type,
+    get_numpy_dtype_for_postgres_type,
     get_python_type_for_postgres_type,
 )
 
@@ -48,10 +52,26 @@ def get_postgres_type_for_statement(
     return PostgresType(postgres_type_name, postgres_type_fields)
 
 
-def get_python_for_postgres_type(postgres_type: PostgresType) -> str:
+def get_python_dataclass_decorator(is_frozen: bool, is_slotted: bool) -> str:
+    dataclass_arguments = (["frozen=True"] if is_frozen else []) + (
+        ["slots=True"] if is_slotted else []
+    )
+    if len(dataclass_arguments) == 0:
+        return "@dataclass"
+    return f"@dataclass({', '.join(dataclass_arguments)})"
+
+
+def get_python_for_postgres_type(
+    postgres_type: PostgresType,
+    is_frozen: bool = False,
+    is_slotted: bool = False,
+) -> str:
     python_type_name = postgres_type.get_python_name()
     python_type_declaration = f"class {python_type_name}:"
-    python_lines = ["@dataclass", python_type_declaration]
+    python_lines = [
+        get_python_dataclass_decorator(is_frozen, is_slotted),
+        python_type_declaration,
+    ]
     for type_field in postgres_type.type_fields:
         python_type = get_python_type_for_postgres_type(type_field.field_type)
         python_type_field_str = f"{tab}{type_field.field_name}: {python_type}"
@@ -59,6 +79,88 @@ def get_python_for_postgres_type(postgres_type: PostgresType) -> str:
     return "\n".join(python_lines)
 
 
+def get_python_tuple_expression_for_postgres_type_field(
+    postgres_type_field: PostgresTypeField,
+) -> str:
+    field_type = postgres_type_field.field_type
+    field_value = f"value.{postgres_type_field.field_name}"
+    if not is_user_defined_type(field_type):
+        return field_value
+    to_tuple_function_name = (
+        get_python_to_tuple_function_name_for_postgres_type_name(field_type)
+    )
+    if is_postgres_array_type(field_type):
+        return f"[{to_tuple_function_name}(item) if item is not None else None for item in {field_value}] if {field_value} is not None else None"
+    if is_postgres_type_nullable(field_type):
+        return f"{to_tuple_function_name}({field_value}) if {field_value} is not None else None"
+    return f"{to_tuple_function_name}({field_value})"
+
+
+def get_python_to_tuple_for_postgres_type(postgres_type: PostgresType) -> str:
+    to_tuple_function_name = (
+        get_python_to_tuple_function_name_for_postgres_type_name(
+            postgres_type.type_name
+        )
+    )
+    python_lines = [
+        f"def {to_tuple_function_name}(value: {postgres_type.get_python_name()}) -> tuple[Any, ...]:",
+        f"{tab}return (",
+        *[
+            f"{tab * 2}{get_python_tuple_expression_for_postgres_type_field(type_field)},"
+            for type_field in postgres_type.type_fields
+        ],
+        f"{tab})",
+    ]
+    return "\n".join(python_lines)
+
+
+def get_python_namedtuple_for_postgres_type(postgres_type: PostgresType) -> str:
+    python_type_name = postgres_type.get_python_name()
+    python_lines = [f"class {python_type_name}Tuple(NamedTuple):"]
+    for type_field in postgres_type.type_fields:
+        python_type = get_python_type_for_postgres_type(type_field.field_type)
+        python_lines.append(f"{tab}{type_field.field_name}: {python_type}")
+    return "\n".join(python_lines)
+
+
+def get_python_arrays_for_postgres_type(postgres_type: PostgresType) -> str:
+    type_name = postgres_type.type_name.lower()
+    dtype_lines = [
+        f'{tab * 2}("{type_field.field_name}", "{get_numpy_dtype_for_postgres_type(type_field.field_type)}"),'
+        for type_field in postgres_type.type_fields
+    ]
+    column_lines = [
+        f'{tab * 2}"{type_field.field_name}": records["{type_field.field_name}"].copy(),'
+        for type_field in postgres_type.type_fields
+    ]
+    python_lines = [
+        f"{type_name}_dtype = numpy.dtype(",
+        f"{tab}[",
+        *dtype_lines,
+        f"{tab}]",
+        ")",
+        "",
+        "",
+        f"def get_{type_name}_arrays(rows: Iterable[tuple[Any, ...]], row_count: int) -> dict[str, numpy.ndarray]:",
+        f"{tab}records = numpy.fromiter(rows, dtype={type_name}_dtype, count=row_count)",
+        f"{tab}return {{",
+        *column_lines,
+        f"{tab}}}",
+    ]
+    return "\n".join(python_lines)
+
+
+def get_python_timezone_warning_filter() -> str:
+    return 'warnings.filterwarnings("ignore", "no explicit representation of timezones", UserWarning, __name__)'
+
+
+def is_namedtuple_row_factory_used(codegen_options: CodegenOptions) -> bool:
+    return codegen_options.row_factory == "namedtuple" or any(
+        row_factory == "namedtuple"
+        for _, row_factory in codegen_options.row_factory_functions
+    )
+
+
 def check_if_type_in_code(python_code_str: str, type_to_check: str) -> bool:
     return (
         f": {type_to_check}" in python_code_str
@@ -71,14 +173,27 @@ def get_stdlib_imports_for_python_code_str(
     python_code_str: str,
 ) -> str:
     python_imports: list[str] = ["from dataclasses import dataclass"]
+    if "warnings.filterwarnings(" in python_code_str:
+        python_imports.insert(0, "import warnings")
     if check_if_type_in_code(python_code_str, "datetime"):
         python_imports.append("from datetime import datetime")
     if check_if_type_in_code(python_code_str, "timedelta"):
         python_imports.append("from datetime import timedelta")
     if check_if_type_in_code(python_code_str, "Decimal"):
         python_imports.append("from decimal import Decimal")
+    typing_imports: list[str] = []
+    if "tuple[Any, ...]" in python_code_str:
+        typing_imports.append("Any")
+    if "Iterable[" in python_code_str:
+        typing_imports.append("Iterable")
+    if "(NamedTuple):" in python_code_str:
+        typing_imports.append("NamedTuple")
     if "Optional[" in python_code_str:
-        python_imports.append("from typing import Optional")
+        typing_imports.append("Optional")
+    if len(typing_imports) > 0:
+        python_imports.append(f"from typing import {', '.join(typing_imports)}")
+    if "numpy." in python_code_str:
+        python_imports.append("import numpy")
     if check_if_type_in_code(python_code_str, "Range"):
         python_imports.append("from psycopg.types.range import Range")
     return "\n".join(python_imports)
@@ -112,6 +227,13 @@ def get_user_imports_for_postgres_types(
                         postgres_type_field_module,
                         python_type,
                     )
+                    import_dict = update_python_type_import_dict(
+                        import_dict,
+                        postgres_type_field_module,
+                        get_python_to_tuple_function_name_for_postgres_type_name(
+                            postgres_type_field_base_type
+                        ),
+                    )
                 else:
                     print(
                         f"WARNING: Could not find module for {postgres_type_field_base_type}"
@@ -122,10 +244,35 @@ def get_user_imports_for_postgres_types(
 def get_python_code_for_postgres_types(
     python_postgres_module_lookup: PythonPostgresModuleLookup,
     postgres_types: list[PostgresType],
+    codegen_options: Optional[CodegenOptions] = None,
 ) -> str:
+    if codegen_options is None:
+        codegen_options = CodegenOptions()
     python_type_codes = [
-        get_python_for_postgres_type(postgres_type) for postgres_type in postgres_types
+        get_python_for_postgres_type(
+            postgres_type, codegen_options.frozen, codegen_options.slots
+        )
+        for postgres_type in postgres_types
     ]
+    python_type_codes.extend(
+        get_python_to_tuple_for_postgres_type(postgres_type)
+        for postgres_type in postgres_types
+    )
+    if is_namedtuple_row_factory_used(codegen_options):
+        python_type_codes.extend(
+            get_python_namedtuple_for_postgres_type(postgres_type)
+            for postgres_type in postgres_types
+        )
+    if codegen_options.arrays:
+        python_arrays_codes = [
+            get_python_arrays_for_postgres_type(postgres_type)
+            for postgres_type in postgres_types
+        ]
+        if any(
+            '"datetime64' in python_code for python_code in python_arrays_codes
+        ):
+            python_type_codes.insert(0, get_python_timezone_warning_filter())
+        python_type_codes.extend(python_arrays_codes)
     python_code_str = "\n\n\n".join(python_type_codes)
     stdlib_python_imports = get_stdlib_imports_for_python_code_str(python_code_str)
     user_python_imports = get_user_imports_for_postgres_types(
@@ -147,19 +294,3 @@ def get_postgres_types_for_postgres_statements(
         if (postgres_type := get_postgres_type_for_statement(statement)) is not None
     ]
     return postgres_types
-
-
-def get_python_postgres_module_for_postgres_type_file(
-    postgres_scripts_path: Path,
-    python_output_module: str,
-    python_postgres_module_lookup: PythonPostgresModuleLookup,
-    file_path: Path,
-) -> tuple[PythonPostgresModuleLookup, PythonPostgresModule[PostgresType]]:
-    return get_postgres_module_for_postgres_file(
-        get_postgres_type_for_statement,
-        get_python_code_for_postgres_types,
-        postgres_scripts_path,
-        python_output_module,
-        python_postgres_module_lookup,
-        file_path,
-    )
@@ -1,14 +1,19 @@
+import os
+import threading
 import time
 
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
-from postgrescodegen.classes import DbCredentials
-from postgrescodegen.processor import process_all_script_files
+from postgrescodegen.classes import CodegenOptions, DbCredentials
+from postgrescodegen.processor import (
+    process_all_script_files,
+    process_changed_script_files,
+)
+from postgrescodegen.profiling import StageTimer, report_profile
 
 
 class WatcherHandler(FileSystemEventHandler):
@@ -20,18 +25,88 @@ class WatcherHandler(FileSystemEventHandler):
         output_module_name: str,
         roll_scripts: bool,
         db_credentials: Optional[DbCredentials],
+        manifest_path: Optional[Path],
+        jobs: int,
+        roll_mode: str,
+        debounce_seconds: float,
+        profile_path: Optional[Path],
+        codegen_options: CodegenOptions,
     ):
-        self.last_trigger_time = datetime.now()
         self.internal_scripts_path = internal_scripts_path
         self.user_scripts_path = user_scripts_path
         self.output_package_dir = output_package_dir
         self.output_module_name = output_module_name
         self.roll_scripts = roll_scripts
         self.db_credentials = db_credentials
+        self.manifest_path = manifest_path
+        self.jobs = jobs
+        self.roll_mode = roll_mode
+        self.debounce_seconds = debounce_seconds
+        self.profile_path = profile_path
+        self.codegen_options = codegen_options
+        self.condition = threading.Condition()
+        self.has_pending_changes = False
+        self.pending_changed_script_files: Optional[set[Path]] = set()
+        self.last_event_time = time.monotonic()
+        self.is_stopped = False
+        self.worker = threading.Thread(
+            target=self.process_pending_changes, name="postgrescodegen-watcher"
+        )
+        self.worker.start()
 
-    def process_script_files_if_appropriate(self):
-        current_time = datetime.now()
-        if (current_time - self.last_trigger_time) > timedelta(seconds=1):
+    def queue_changed_script_files(
+        self, changed_script_files: Optional[set[Path]]
+    ):
+        if changed_script_files is not None and len(changed_script_files) == 0:
+            return
+        with self.condition:
+            if (
+                changed_script_files is None
+                or self.pending_changed_script_files is None
+            ):
+                self.pending_changed_script_files = None
+            else:
+                self.pending_changed_script_files |= changed_script_files
+            self.has_pending_changes = True
+            self.last_event_time = time.monotonic()
+            self.condition.notify()
+
+    def wait_for_pending_changes(self) -> tuple[bool, Optional[set[Path]]]:
+        with self.condition:
+            while True:
+                if self.is_stopped:
+                    return False, None
+                if not self.has_pending_changes:
+                    self.condition.wait()
+                    continue
+                remaining_seconds = self.debounce_seconds - (
+                    time.monotonic() - self.last_event_time
+                )
+                if remaining_seconds > 0:
+                    self.condition.wait(remaining_seconds)
+                    continue
+                changed_script_files = self.pending_changed_script_files
+                self.has_pending_changes = False
+                self.pending_changed_script_files = set()
+                return True, changed_script_files
+
+    def process_pending_changes(self):
+        while True:
+            has_changes, changed_script_files = self.wait_for_pending_changes()
+            if not has_changes:
+                return
+            try:
+                self.process_script_files(changed_script_files)
+            except Exception as e:
+                print(
+                    f"Error while regenerating code, waiting for the next change: {type(e).__name__}: {e}",
+                    flush=True,
+                )
+
+    def process_script_files(self, changed_script_files: Optional[set[Path]]):
+        stage_timer = StageTimer() if self.profile_path is not None else None
+        if changed_script_files is None:
+            print("Regenerating code for all script files", flush=True)
             process_all_script_files(
                 self.internal_scripts_path,
                 self.user_scripts_path,
@@ -39,16 +114,63 @@ class WatcherHandler(FileSystemEventHandler):
                 self.output_module_name,
                 self.roll_scripts,
                 self.db_credentials,
+                self.manifest_path,
+                self.jobs,
+                self.roll_mode,
+                stage_timer=stage_timer,
+                codegen_options=self.codegen_options,
             )
+        else:
+            print(
+                f"Regenerating code for {len(changed_script_files)} changed files",
+                flush=True,
+            )
+            process_changed_script_files(
+                self.internal_scripts_path,
+                self.user_scripts_path,
+                self.output_package_dir,
+                self.output_module_name,
+                self.roll_scripts,
+                self.db_credentials,
+                self.manifest_path,
+                changed_script_files,
+                self.jobs,
+                self.roll_mode,
+                stage_timer,
+                self.codegen_options,
+            )
+        if stage_timer is not None and self.profile_path is not None:
+            report_profile(stage_timer, self.profile_path)
+
+    def stop(self):
+        with self.condition:
+            self.is_stopped = True
+            self.condition.notify()
+        self.worker.join()
 
     def on_created(self, event: FileSystemEvent):
-        self.process_script_files_if_appropriate()
+        self.queue_changed_script_files(get_changed_script_files(event))
 
     def on_modified(self, event: FileSystemEvent):
-        self.process_script_files_if_appropriate()
+        if not event.is_directory:
+            self.queue_changed_script_files(get_changed_script_files(event))
 
     def on_moved(self, event: FileSystemEvent):
-        self.process_script_files_if_appropriate()
+        self.queue_changed_script_files(get_changed_script_files(event))
+
+    def on_deleted(self, event: FileSystemEvent):
+        self.queue_changed_script_files(get_changed_script_files(event))
+
+
+def get_changed_script_files(event: FileSystemEvent) -> Optional[set[Path]]:
+    if event.is_directory:
+        return None
+    event_paths = [event.src_path, event.dest_path]
+    return {
+        Path(os.fsdecode(event_path)).resolve()
+        for event_path in event_paths
+        if event_path != "" and os.fsdecode(event_path).endswith(".sql")
+    }
 
 
 def start_watcher(
@@ -58,7 +180,15 @@ def start_watcher(
     output_module_name: str,
     roll_scripts: bool,
     db_credentials: Optional[DbCredentials],
+    manifest_path: Optional[Path],
+    jobs: int,
+    roll_mode: str,
+    debounce_seconds: float = 1.0,
+    profile_path: Optional[Path] = None,
+    codegen_options: Optional[CodegenOptions] = None,
 ):
+    if codegen_options is None:
+        codegen_options = CodegenOptions()
     event_handler = WatcherHandler(
         internal_scripts_path,
         user_scripts_path,
@@ -66,6 +196,12 @@ def start_watcher(
         output_module_name,
         roll_scripts,
         db_credentials,
+        manifest_path,
+        jobs,
+        roll_mode,
+        debounce_seconds,
+        profile_path,
+        codegen_options,
     )
     observer = Observer()
     observer.schedule(event_handler, str(user_scripts_path), recursive=True)
@@ -78,3 +214,4 @@ def start_watcher(
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    event_handler.stop()